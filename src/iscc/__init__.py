@@ -1,6 +1,14 @@
 # -*- coding: utf-8 -*-
 from iscc.iscc import *
 from iscc.const import *
+from iscc.cdc import *
+from iscc.readers import *
+from iscc.minhash import *
+from iscc.image import *
+from iscc.codes import *
+from iscc.hamming import *
+from iscc.index import *
+from iscc.lsh import *
 
 
 __version__ = "1.0.5"
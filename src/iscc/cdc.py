@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""Accelerated Content Defined Chunking (optional, requires numpy)
+
+Computes the same GEAR1/GEAR2 chunk boundaries as `data_chunks` but evaluates
+the rolling gear hash for a whole buffer in bulk instead of byte by byte.
+"""
+from bisect import bisect_left
+from iscc.const import *
+from iscc.readers import stream_fill
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+CDC_BLOCK_SIZE = 2 ** 20
+
+# (norm_size, min_size, max_size, mask_1, mask_2) per chunking stage
+CDC_GEARS = (
+    (GEAR1_NORM, GEAR1_MIN, GEAR1_MAX, GEAR1_MASK1, GEAR1_MASK2),
+    (GEAR2_NORM, GEAR2_MIN, GEAR2_MAX, GEAR2_MASK1, GEAR2_MASK2),
+)
+
+# Number of GEAR1 chunks before switching to GEAR2
+CDC_GEAR1_CHUNKS = 100
+
+
+def cdc_chunks(data, block_size=CDC_BLOCK_SIZE, views=False):
+
+    if isinstance(data, str):
+        data = open(data, "rb")
+
+    # Each window holds at least one complete GEAR2 chunk beyond `block_size`.
+    window_size = block_size + GEAR2_MAX
+
+    if hasattr(data, "read"):
+        stream = data
+        buffer = memoryview(bytearray(window_size))
+        end = 0
+    else:
+        stream = None
+        buffer = memoryview(data).cast("B")
+        end = len(buffer)
+
+    start = 0
+    counter = 0
+    while True:
+        if stream is not None:
+            buffer[: end - start] = buffer[start:end]
+            start, end = 0, end - start
+            size = stream_fill(stream, buffer[end:])
+            if end + size < len(buffer):
+                stream = None
+            end += size
+
+        if start == end:
+            break
+
+        window = buffer[start : min(end, start + window_size)]
+        final = stream is None and start + len(window) == end
+        sizes = cdc_sizes(window, counter, final)
+        for size in sizes:
+            chunk = buffer[start : start + size]
+            # Yielded views are only valid until the next chunk is requested.
+            yield chunk if views else chunk.tobytes()
+            start += size
+        counter += len(sizes)
+
+
+def cdc_sizes(data, counter=0, final=True):
+    """
+    Return the sizes of all chunks that can be cut from the start of `data`.
+
+    `counter` is the number of chunks already cut before `data` and selects the
+    GEAR1 or GEAR2 parameters. Unless `final` is set, chunking stops as soon as
+    less than `max_size` bytes remain, because the next boundary may depend on
+    data that has not been seen yet.
+    """
+
+    if np is None:
+        raise ImportError("cdc_sizes requires numpy")
+
+    length = len(data)
+    hashes = gear_hashes(data) if length else None
+    candidates = {}
+    sizes = []
+    start = 0
+
+    while start < length:
+        gear = 0 if counter < CDC_GEAR1_CHUNKS else 1
+        norm_size, min_size, max_size, mask_1, mask_2 = CDC_GEARS[gear]
+        avail = length - start
+
+        if avail < max_size and not final:
+            break
+
+        if avail <= min_size:
+            sizes.append(avail)
+            break
+
+        if gear not in candidates:
+            # GEAR1 chunks never reach beyond the first 100 * GEAR1_MAX bytes.
+            limit = length if gear else CDC_GEAR1_CHUNKS * GEAR1_MAX
+            candidates[gear] = (
+                np.flatnonzero((hashes[:limit] & np.uint64(mask_1)) == 0).tolist(),
+                np.flatnonzero((hashes[:limit] & np.uint64(mask_2)) == 0).tolist(),
+            )
+        cands_1, cands_2 = candidates[gear]
+
+        low = start + min_size
+        norm_end = start + min(norm_size, avail)
+        max_end = start + min(max_size, avail)
+        boundary = None
+
+        # The gear pattern restarts at `low` for every chunk. Up to `exact`
+        # positions after `low` its masked bits still differ from the bulk
+        # rolling hash and must be corrected for the bytes before `low`.
+        shifts, masks = _exact_plan(gear)
+        exact_end = min(low + len(shifts), max_end)
+        n = exact_end - low
+        pattern = hashes[low:exact_end] - (hashes[low - 1] << shifts[:n])
+        hits = np.flatnonzero((pattern & masks[:n]) == 0)
+        if len(hits):
+            boundary = low + int(hits[0])
+
+        if boundary is None:
+            idx = bisect_left(cands_1, exact_end)
+            if idx < len(cands_1) and cands_1[idx] < norm_end:
+                boundary = cands_1[idx]
+
+        if boundary is None:
+            idx = bisect_left(cands_2, max(exact_end, norm_end))
+            if idx < len(cands_2) and cands_2[idx] < max_end:
+                boundary = cands_2[idx]
+
+        if boundary is None:
+            boundary = max_end
+
+        sizes.append(boundary - start)
+        start = boundary
+        counter += 1
+
+    return sizes
+
+
+def gear_hashes(data):
+    """
+    Return the rolling gear pattern at every position of `data` as uint64 array.
+
+    Equivalent to `pattern = ((pattern << 1) + CHUNKING_GEAR[byte]) & MAX_INT64`
+    evaluated over the whole buffer. As only the last 64 bytes contribute to a
+    64-bit pattern the window is built by doubling in six vectorized steps.
+    """
+
+    hashes = CHUNKING_GEAR_NP[np.frombuffer(data, dtype=np.uint8)]
+    shift = 1
+    while shift < 64:
+        hashes[shift:] += hashes[:-shift] << np.uint64(shift)
+        shift *= 2
+    return hashes
+
+
+def _exact_plan(gear):
+
+    if gear not in _EXACT_PLANS:
+        norm_size, min_size, _, mask_1, mask_2 = CDC_GEARS[gear]
+        exact = (mask_1 | mask_2).bit_length() - 1
+        shifts = np.arange(1, exact + 1, dtype=np.uint64)
+        masks = np.array(
+            [mask_1 if i < norm_size - min_size else mask_2 for i in range(exact)],
+            dtype=np.uint64,
+        )
+        _EXACT_PLANS[gear] = shifts, masks
+    return _EXACT_PLANS[gear]
+
+
+_EXACT_PLANS = {}
+
+CHUNKING_GEAR_NP = np.array(CHUNKING_GEAR, dtype=np.uint64) if np else None
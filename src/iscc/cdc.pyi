@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+from typing import *
+from iscc.iscc import B
+
+CDC_BLOCK_SIZE: int
+CDC_GEARS: Tuple[Tuple[int, int, int, int, int], ...]
+CDC_GEAR1_CHUNKS: int
+
+def cdc_chunks(
+    data: B, block_size: int = CDC_BLOCK_SIZE, views: bool = False
+) -> Generator[Union[bytes, memoryview], None, None]: ...
+def cdc_sizes(data: ByteString, counter: int = 0, final: bool = True) -> List[int]: ...
+def gear_hashes(data: ByteString) -> Any: ...
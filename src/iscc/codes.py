@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""Bulk conversion between ISCC codes and integer arrays
+
+`decode_codes` turns a sequence of 11 or 13 character codes into an array of
+1-byte headers and an array of 64-bit bodies, `encode_codes` does the reverse.
+With numpy the base58-iscc digits of all codes are converted at once with
+lookup tables and wrapping uint64 arithmetic, otherwise `array("B")` and
+`array("Q")` are filled code by code. Results equal `decode`/`encode`.
+"""
+from array import array
+from iscc.const import *
+from iscc.iscc import decode, encode
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def decode_codes(codes):
+
+    codes = codes if hasattr(codes, "__len__") else list(codes)
+    width = code_width(codes)
+
+    if np is None:
+        return decode_codes_py(codes, width)
+
+    try:
+        data = "".join(codes).encode("ascii")
+    except UnicodeEncodeError:
+        headers, bodies = decode_codes_py(codes, width)
+        headers = None if headers is None else np.frombuffer(headers, np.uint8)
+        return [headers, np.frombuffer(bodies, np.uint64)]
+
+    # 1. Symbols to digits (unknown ASCII symbols keep their ordinal)
+    digits = CODE_DIGITS_NP[np.frombuffer(data, np.uint8).reshape(-1, width)]
+
+    # 2. Header byte from the first two digits of 13 character codes
+    headers = None
+    if width == 13:
+        headers = ((digits[:, 0] * 58 + digits[:, 1]) & 0xFF).astype(np.uint8)
+
+    # 3. 64-bit bodies from the last 11 digits (uint64 wraps like `decode`)
+    bodies = np.zeros(len(digits), dtype=np.uint64)
+    for column in digits[:, -11:].T:
+        bodies *= np.uint64(58)
+        bodies += column
+    return [headers, bodies]
+
+
+def decode_codes_py(codes, width):
+
+    headers = array("B") if width == 13 else None
+    bodies = array("Q")
+    for code in codes:
+        digest = decode(code)
+        if headers is not None:
+            headers.append(digest[0])
+        bodies.append(int.from_bytes(digest[-8:], "big", signed=False))
+    return [headers, bodies]
+
+
+def encode_codes(headers, bodies):
+
+    if headers is not None and len(headers) != len(bodies):
+        raise ValueError("Headers and bodies must have the same length")
+
+    if np is None:
+        return encode_codes_py(headers, bodies)
+
+    # 1. 11 base58 digits per 64-bit body (least significant first)
+    values = np.array(bodies, dtype=np.uint64)
+    width = 11 if headers is None else 13
+    digits = np.empty((len(values), width), dtype=np.uint8)
+    for i in range(width - 1, width - 12, -1):
+        digits[:, i] = values % np.uint64(58)
+        values //= np.uint64(58)
+
+    # 2. Two digits per header byte
+    if headers is not None:
+        headers = np.asarray(headers, dtype=np.uint8)
+        digits[:, 0], digits[:, 1] = np.divmod(headers, 58)
+
+    # 3. Digits to symbols and split into fixed width codes
+    text = CODE_SYMBOLS_NP[digits].tobytes().decode("ascii")
+    return [text[i : i + width] for i in range(0, len(text), width)]
+
+
+def encode_codes_py(headers, bodies):
+
+    if headers is None:
+        return [encode(body.to_bytes(8, "big", signed=False)) for body in bodies]
+    return [
+        encode(bytes((header,)) + body.to_bytes(8, "big", signed=False))
+        for header, body in zip(headers, bodies)
+    ]
+
+
+def code_width(codes):
+
+    lengths = set(map(len, codes))
+    if len(lengths) > 1 or not lengths <= {11, 13}:
+        raise ValueError("Codes must all be 11 or all be 13 chars long")
+    return lengths.pop() if lengths else 13
+
+
+if np:
+    CODE_DIGITS_NP = np.arange(256, dtype=np.uint64)
+    CODE_DIGITS_NP[np.frombuffer(SYMBOLS.encode("ascii"), np.uint8)] = np.arange(58)
+    CODE_SYMBOLS_NP = np.frombuffer(SYMBOLS.encode("ascii"), np.uint8)
+else:  # pragma: no cover
+    CODE_DIGITS_NP = CODE_SYMBOLS_NP = None
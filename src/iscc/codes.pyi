@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+from array import array
+from typing import *
+
+def decode_codes(codes: Iterable[str]) -> List[Any]: ...
+def decode_codes_py(codes: Iterable[str], width: int) -> List[Optional[array]]: ...
+def encode_codes(
+    headers: Optional[Sequence[int]], bodies: Sequence[int]
+) -> List[str]: ...
+def encode_codes_py(
+    headers: Optional[Sequence[int]], bodies: Sequence[int]
+) -> List[str]: ...
+def code_width(codes: Iterable[str]) -> int: ...
+
+CODE_DIGITS_NP: Any
+CODE_SYMBOLS_NP: Any
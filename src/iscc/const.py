@@ -50,6 +50,10 @@ SYMBOLS = "C23456789rB1ZEFGTtYiAaVvMmHUPWXKDNbcdefghLjkSnopRqsJuQwxyz"
 VALUES = "".join([chr(i) for i in range(58)])
 C2VTABLE = str.maketrans(SYMBOLS, VALUES)
 V2CTABLE = str.maketrans(VALUES, SYMBOLS)
+# Lookup tables for single symbols and pairs of symbols (58 * 58 values)
+SYMBOL_VALUES = {c: i for i, c in enumerate(SYMBOLS)}
+SYMBOL_PAIRS = [a + b for a in SYMBOLS for b in SYMBOLS]
+SYMBOL_PAIR_VALUES = {pair: i for i, pair in enumerate(SYMBOL_PAIRS)}
 INPUT_TRIM = 128
 WINDOW_SIZE_MID = 4
 WINDOW_SIZE_CID_T = 13
@@ -67,6 +71,34 @@ GEAR2_MAX = 65536
 GEAR2_MASK1 = 0x0003590703530000
 GEAR2_MASK2 = 0x0000D90003530000
 
+# Size of the reusable read buffer for streaming Data-ID chunking
+DATA_BUFFER_SIZE = 4 * GEAR2_MAX
+
+# Number of records per deduplication scope and worker task of batch Meta-IDs
+META_BATCH_SIZE = 4096
+
+# Number of digests per bit counting step of similarity_hash
+SIMHASH_BLOCK_SIZE = 2 ** 12
+
+# Number of comparisons per block of bulk Hamming distance calculations
+DISTANCE_BLOCK_SIZE = 2 ** 20
+
+# Number of characters or bytes read per block by streaming Content-ID-Text
+TEXT_BLOCK_SIZE = 2 ** 20
+
+# Number of blocks of 64-bit bodies in similarity index tables
+INDEX_BLOCKS = 4
+
+# Minimum number of pending entries before similarity index tables are rebuilt
+INDEX_PENDING = 2 ** 16
+
+# Number of bands and rows per band of minhash LSH indexes (64 minhashes)
+LSH_BANDS = 16
+LSH_ROWS = 4
+
+# Minimum image size kept by integer reduction in fast image decode mode
+FAST_REDUCE_SIZE = 128
+
 MINHASH_PERMUTATIONS = [
     (853146490016488653, 1089606993368836715),
     (1849332765672628665, 726972438868274737),
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Hamming distances between many 64-bit code bodies
+
+`distance_many` compares one query with an array of bodies (as returned by
+`decode_codes`), `distance_matrix` compares all pairs of two arrays. Both work
+in blocks of `DISTANCE_BLOCK_SIZE` comparisons so temporary memory is bounded,
+and with a `threshold` only the matches (distance <= threshold) are kept.
+With numpy popcounts use `bitwise_count` (numpy >= 2) or a byte lookup table,
+otherwise `int.bit_count` (Python >= 3.10) or `bin(x).count("1")`.
+"""
+from array import array
+from iscc.const import *
+from iscc.codes import decode_codes
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def distance_many(query, bodies, threshold=None, block_size=DISTANCE_BLOCK_SIZE):
+
+    query = body_value(query)
+
+    if np is None:
+        distances = array("B", (popcount(query ^ body) for body in bodies))
+        if threshold is None:
+            return distances
+        indices = array("Q", (i for i, d in enumerate(distances) if d <= threshold))
+        return [indices, array("B", (distances[i] for i in indices))]
+
+    bodies = np.asarray(bodies, dtype=np.uint64)
+    query = np.uint64(query)
+
+    if threshold is None:
+        distances = np.empty(len(bodies), dtype=np.uint8)
+        for i in range(0, len(bodies), block_size):
+            block = bodies[i : i + block_size]
+            distances[i : i + len(block)] = popcount64(block ^ query)
+        return distances
+
+    indices, distances = [], []
+    for i in range(0, len(bodies), block_size):
+        block_distances = popcount64(bodies[i : i + block_size] ^ query)
+        block_indices = np.flatnonzero(block_distances <= threshold)
+        indices.append(block_indices + i)
+        distances.append(block_distances[block_indices])
+    return [_concat(indices, np.int64), _concat(distances, np.uint8)]
+
+
+def distance_matrix(a, b, threshold=None, block_size=DISTANCE_BLOCK_SIZE):
+
+    if np is None:
+        a, b = [body_value(x) for x in a], [body_value(x) for x in b]
+        if threshold is None:
+            return [array("B", (popcount(x ^ y) for y in b)) for x in a]
+        rows, cols, distances = array("Q"), array("Q"), array("B")
+        for i, x in enumerate(a):
+            for j, y in enumerate(b):
+                d = popcount(x ^ y)
+                if d <= threshold:
+                    rows.append(i)
+                    cols.append(j)
+                    distances.append(d)
+        return [rows, cols, distances]
+
+    a = np.asarray(a, dtype=np.uint64)
+    b = np.asarray(b, dtype=np.uint64)
+    step = max(block_size // max(len(b), 1), 1)
+
+    if threshold is None:
+        matrix = np.empty((len(a), len(b)), dtype=np.uint8)
+        for i in range(0, len(a), step):
+            block = a[i : i + step, None] ^ b[None, :]
+            matrix[i : i + len(block)] = popcount64(block)
+        return matrix
+
+    rows, cols, distances = [], [], []
+    for i in range(0, len(a), step):
+        block_distances = popcount64(a[i : i + step, None] ^ b[None, :])
+        block_rows, block_cols = np.nonzero(block_distances <= threshold)
+        rows.append(block_rows + i)
+        cols.append(block_cols)
+        distances.append(block_distances[block_rows, block_cols])
+    return [
+        _concat(rows, np.int64),
+        _concat(cols, np.int64),
+        _concat(distances, np.uint8),
+    ]
+
+
+def popcount64(values):
+    """Number of set bits of each value in a uint64 array as uint8 array."""
+
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    values = np.ascontiguousarray(values)
+    counts = POPCOUNT_TABLE_NP[values.view(np.uint8)]
+    return counts.reshape(values.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def body_value(value):
+    """64-bit body of a code, a 8 or 9 byte digest or an integer."""
+
+    if isinstance(value, str):
+        return int(decode_codes([value])[1][0])
+    if isinstance(value, (bytes, bytearray)):
+        return int.from_bytes(value[-8:], "big", signed=False)
+    return int(value)
+
+
+def _concat(arrays, dtype):
+
+    return np.concatenate(arrays).astype(dtype) if arrays else np.empty(0, dtype)
+
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:  # pragma: no cover
+
+    def popcount(value):
+
+        return bin(value).count("1")
+
+
+if np:
+    POPCOUNT_TABLE_NP = np.array([bin(i).count("1") for i in range(256)], np.uint8)
+else:  # pragma: no cover
+    POPCOUNT_TABLE_NP = None
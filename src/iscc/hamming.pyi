@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from typing import *
+
+BODY = Union[str, bytes, int]
+
+def distance_many(
+    query: BODY,
+    bodies: Sequence[int],
+    threshold: Optional[int] = None,
+    block_size: int = ...,
+) -> Any: ...
+def distance_matrix(
+    a: Sequence[int],
+    b: Sequence[int],
+    threshold: Optional[int] = None,
+    block_size: int = ...,
+) -> Any: ...
+def popcount64(values: Any) -> Any: ...
+def body_value(value: BODY) -> int: ...
+def popcount(value: int) -> int: ...
+
+POPCOUNT_TABLE_NP: Any
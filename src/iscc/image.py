@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Vectorized Content-ID-Image hashing (optional, requires numpy)
+
+Hashes stacks of normalized 32x32 frames with a precomputed DCT basis matrix.
+Only the upper-left 8x8 coefficients are computed, as two small matrix
+products per frame. Frames where any coefficient lies within `DCT_TOLERANCE`
+of the median (where float rounding could flip a bit) are recomputed with an
+exact vectorized emulation of the reference `dct`, so digests always equal
+those of `image_hash`.
+"""
+import math
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+# Absolute rounding error bound for matrix product coefficients (by far larger
+# than the actual error of about 1e-10 for 32x32 frames of 8-bit pixels).
+DCT_TOLERANCE = 1e-6
+
+
+def image_hash_batch(frames):
+
+    if np is None:
+        raise ImportError("image_hash_batch requires numpy")
+
+    # 1. Stack frames to (N, 32, 32) float array
+    pixels = image_frames(frames)
+
+    # 2. Upper-left 8x8 DCT coefficients per frame via basis matrix
+    basis = dct_matrix(32)[:8]
+    coefficients = np.matmul(np.matmul(basis, pixels), basis.T).reshape(-1, 64)
+
+    # 3. Recompute frames with near-median coefficients exactly
+    medians = np.median(coefficients, axis=1, keepdims=True)
+    margins = np.abs(coefficients - medians).min(axis=1)
+    unsafe = np.flatnonzero(margins <= DCT_TOLERANCE)
+    if len(unsafe):
+        exact = dct_2d_exact(pixels[unsafe])[:, :8, :8].reshape(-1, 64)
+        coefficients[unsafe] = exact
+        medians[unsafe] = np.median(exact, axis=1, keepdims=True)
+
+    # 4. Create 64-bit digests by comparing to median
+    bits = coefficients > medians
+    return [digest.tobytes() for digest in np.packbits(bits, axis=1)]
+
+
+def image_frames(frames):
+    """Stack 32x32 frames (nested lists, 1024 byte buffers, arrays) as floats."""
+
+    if not isinstance(frames, np.ndarray):
+        frames = np.stack([_frame_array(frame) for frame in frames])
+    return frames.reshape(-1, 32, 32).astype(np.float64)
+
+
+@lru_cache(maxsize=None)
+def dct_matrix(n):
+    """
+    Cached (n, n) basis of the unscaled DCT-II computed by `dct`.
+
+    `dct_matrix(n) @ values` equals `dct(values)` up to float rounding.
+    """
+
+    k = np.arange(n, dtype=np.float64)[:, None]
+    i = np.arange(n, dtype=np.float64)[None, :]
+    matrix = np.cos(math.pi / n * (i + 0.5) * k)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def dct_2d_exact(pixels):
+    """Full 2D DCT of (N, 32, 32) frames, bit-identical to the reference."""
+
+    rows = dct_exact(pixels)
+    cols = dct_exact(rows.swapaxes(-1, -2))
+    return cols.swapaxes(-1, -2)
+
+
+def dct_exact(values):
+    """
+    Vectorized emulation of the recursive `dct` along the last axis.
+
+    Performs the same float operations in the same order as the reference
+    implementation, so results are bit-identical.
+    """
+
+    n = values.shape[-1]
+    if n == 1:
+        return values.copy()
+    elif n == 0 or n % 2 != 0:
+        raise ValueError()
+
+    half = n // 2
+    front = values[..., :half]
+    back = values[..., : -half - 1 : -1]
+    alpha = dct_exact(front + back)
+    beta = dct_exact((front - back) / _dct_factors(n))
+
+    result = np.empty(values.shape, dtype=np.float64)
+    result[..., 0 : n - 2 : 2] = alpha[..., :-1]
+    result[..., 1 : n - 2 : 2] = beta[..., :-1] + beta[..., 1:]
+    result[..., n - 2] = alpha[..., -1]
+    result[..., n - 1] = beta[..., -1]
+    return result
+
+
+@lru_cache(maxsize=None)
+def _dct_factors(n):
+
+    return np.array([math.cos((i + 0.5) * math.pi / n) * 2.0 for i in range(n // 2)])
+
+
+def _frame_array(frame):
+
+    if isinstance(frame, (bytes, bytearray, memoryview)):
+        return np.frombuffer(frame, dtype=np.uint8)
+    return np.asarray(frame)
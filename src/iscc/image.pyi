@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+from typing import *
+
+FRAME = Union[Sequence[Sequence[int]], ByteString, Any]
+
+DCT_TOLERANCE: float
+
+def image_hash_batch(frames: Union[Iterable[FRAME], Any]) -> List[bytes]: ...
+def image_frames(frames: Union[Iterable[FRAME], Any]) -> Any: ...
+def dct_matrix(n: int) -> Any: ...
+def dct_2d_exact(pixels: Any) -> Any: ...
+def dct_exact(values: Any) -> Any: ...
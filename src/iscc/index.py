@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""In-memory similarity index for 64-bit code bodies (multi-index hashing)
+
+The 64 bits of each body are split into `blocks` blocks. If two bodies are
+within Hamming distance `k`, at least one block differs in no more than
+`k // blocks` bits (pigeonhole principle). So a range query only has to probe
+every block table with the block values within that radius of the query and
+verify the candidates, instead of scanning all bodies.
+
+With numpy each block table is a sorted permuted table (block values sorted
+with the positions of their bodies, searched with `searchsorted`), otherwise a
+dict from block value to positions. New entries are kept in a pending area
+that is scanned linearly until the tables are rebuilt. Deleted entries are
+masked until the next rebuild.
+
+`SimilarityIndex` keeps one `BodyIndex` per component header, so codes of
+different component types are never compared.
+"""
+
+from array import array
+from functools import lru_cache
+from math import factorial
+from itertools import combinations
+from iscc.const import *
+from iscc.codes import decode_codes
+from iscc.hamming import popcount, popcount64
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class SimilarityIndex:
+    """
+    Index of ISCC codes answering "all codes within distance k" queries.
+
+    Codes are 13 character component codes (or 11 character bodies without
+    header) and are stored under integer ids, by default consecutive numbers
+    in insertion order.
+    """
+
+    def __init__(self, blocks=INDEX_BLOCKS):
+        self.blocks = blocks
+        self.indexes = {}
+        self.next_id = 0
+
+    def __len__(self):
+        return sum(len(index) for index in self.indexes.values())
+
+    def add(self, code, id=None):
+
+        return self.add_many([code], None if id is None else [id])[0]
+
+    def add_many(self, codes, ids=None):
+
+        codes = list(codes)
+        if ids is None:
+            ids = list(range(self.next_id, self.next_id + len(codes)))
+        else:
+            ids = list(ids)
+            if len(ids) != len(codes):
+                raise ValueError("Codes and ids must have the same length")
+        if not codes:
+            return ids
+        self.next_id = max(self.next_id, max(ids) + 1)
+
+        # 1. Split codes into headers and bodies
+        headers, bodies = decode_codes(codes)
+        if headers is None:
+            groups = {None: (bodies, ids)}
+        elif np is None:
+            groups = {}
+            for header, body, id in zip(headers, bodies, ids):
+                group = groups.setdefault(header, (array("Q"), array("Q")))
+                group[0].append(body)
+                group[1].append(id)
+        else:
+            ids = np.asarray(ids, dtype=np.uint64)
+            groups = {}
+            for header in np.unique(headers):
+                mask = headers == header
+                groups[int(header)] = (bodies[mask], ids[mask])
+
+        # 2. Bulk insert per component header
+        for header, (group_bodies, group_ids) in groups.items():
+            if header not in self.indexes:
+                self.indexes[header] = BodyIndex(self.blocks)
+            self.indexes[header].add_many(group_bodies, group_ids)
+        return [int(id) for id in ids]
+
+    def remove(self, id):
+
+        for index in self.indexes.values():
+            if index.remove(id):
+                return
+        raise KeyError(id)
+
+    def query(self, code, k):
+        """Ids and distances of all codes within distance `k`, nearest first."""
+
+        headers, bodies = decode_codes([code])
+        header = None if headers is None else int(headers[0])
+        index = self.indexes.get(header)
+        if index is None:
+            index = BodyIndex(self.blocks)
+        return index.query(int(bodies[0]), k)
+
+    def rebuild(self):
+
+        for index in self.indexes.values():
+            index.rebuild()
+
+
+class BodyIndex:
+    """Multi-index hashing tables over 64-bit bodies of one component type."""
+
+    def __init__(self, blocks=INDEX_BLOCKS):
+        self.spans = block_spans(blocks)
+        self.bodies = array("Q")
+        self.ids = array("Q")
+        self.alive = bytearray()
+        self.deleted = 0
+        self.indexed = 0
+        self.tables = []
+
+    def __len__(self):
+        return len(self.bodies) - self.deleted
+
+    def add_many(self, bodies, ids):
+
+        if np is None:
+            self.bodies.extend(bodies)
+            self.ids.extend(ids)
+        else:
+            self.bodies.frombytes(np.asarray(bodies, dtype=np.uint64).tobytes())
+            self.ids.frombytes(np.asarray(ids, dtype=np.uint64).tobytes())
+        self.alive.extend(b"\x01" * len(ids))
+        if len(self.bodies) - self.indexed > max(INDEX_PENDING, self.indexed // 64):
+            self.rebuild()
+
+    def remove(self, id):
+
+        if np is None:
+            positions = [i for i, x in enumerate(self.ids) if x == id]
+        else:
+            ids = np.frombuffer(self.ids, dtype=np.uint64)
+            positions = np.flatnonzero(ids == np.uint64(id)).tolist()
+            del ids
+        positions = [i for i in positions if self.alive[i]]
+        for i in positions:
+            self.alive[i] = 0
+        self.deleted += len(positions)
+        if self.deleted > len(self.bodies) // 2:
+            self.rebuild()
+        return bool(positions)
+
+    def rebuild(self):
+
+        # 1. Drop deleted entries
+        if self.deleted and np is None:
+            keep = [i for i, alive in enumerate(self.alive) if alive]
+            self.bodies = array("Q", (self.bodies[i] for i in keep))
+            self.ids = array("Q", (self.ids[i] for i in keep))
+        elif self.deleted:
+            keep = np.frombuffer(self.alive, dtype=np.bool_)
+            self.bodies = array(
+                "Q", np.frombuffer(self.bodies, np.uint64)[keep].tobytes()
+            )
+            self.ids = array("Q", np.frombuffer(self.ids, np.uint64)[keep].tobytes())
+        self.alive = bytearray(b"\x01" * len(self.bodies))
+        self.deleted = 0
+
+        # 2. One table per block
+        self.tables = [self._build_table(shift, width) for shift, width in self.spans]
+        self.indexed = len(self.bodies)
+
+    def query(self, body, k):
+
+        # 1. Candidate positions from block tables
+        radius = k // len(self.spans)
+        probes = sum(neighbor_count(width, radius) for _, width in self.spans)
+        candidates = []
+        if probes < self.indexed:
+            for (shift, width), table in zip(self.spans, self.tables):
+                key = (body >> shift) & ((1 << width) - 1)
+                masks = neighbor_masks(width, radius)
+                candidates.extend(self._probe_table(table, key, masks))
+            start = self.indexed
+        else:
+            # More probes than entries (large k), a linear scan is cheaper
+            start = 0
+
+        # 2. Pending entries are scanned linearly
+        candidates.append(range(start, len(self.bodies)))
+
+        # 3. Verify candidates and sort by distance
+        if np is not None:
+            return self._verify_np(candidates, body, k)
+
+        result = {}
+        for positions in candidates:
+            for i in positions:
+                if self.alive[i] and i not in result:
+                    distance = popcount(self.bodies[i] ^ body)
+                    if distance <= k:
+                        result[i] = distance
+        ranked = sorted(result, key=lambda i: (result[i], self.ids[i]))
+        ids = array("Q", (self.ids[i] for i in ranked))
+        return [ids, array("B", (result[i] for i in ranked))]
+
+    def _build_table(self, shift, width):
+
+        if np is None:
+            table = {}
+            for i, body in enumerate(self.bodies):
+                table.setdefault((body >> shift) & ((1 << width) - 1), []).append(i)
+            return table
+
+        bodies = np.frombuffer(self.bodies, dtype=np.uint64)
+        keys = (bodies >> np.uint64(shift)) & np.uint64((1 << width) - 1)
+        keys = keys.astype(key_dtype(width))
+        order = np.argsort(keys, kind="mergesort")
+        order = order.astype(np.uint32 if len(order) < 2 ** 32 else np.int64)
+        return keys[order], order
+
+    def _probe_table(self, table, key, masks):
+
+        if np is None:
+            return [table.get(key ^ mask, ()) for mask in masks]
+
+        keys, order = table
+        probes = np.asarray(masks, dtype=keys.dtype) ^ keys.dtype.type(key)
+        low = np.searchsorted(keys, probes, "left")
+        high = np.searchsorted(keys, probes, "right")
+        counts = high - low
+        # Positions of all matching ranges in one gather
+        starts = np.repeat(low - np.cumsum(counts) + counts, counts)
+        return [order[starts + np.arange(counts.sum())]]
+
+    def _verify_np(self, candidates, body, k):
+
+        bodies = np.frombuffer(self.bodies, dtype=np.uint64)
+        ids = np.frombuffer(self.ids, dtype=np.uint64)
+        alive = np.frombuffer(self.alive, dtype=np.bool_)
+
+        positions = [np.asarray(c, dtype=np.int64) for c in candidates]
+        positions = np.concatenate(positions)
+        positions = positions[alive[positions]]
+        distances = popcount64(bodies[positions] ^ np.uint64(body))
+        # Matches can be found in several blocks, candidates are mostly unique
+        positions, first = np.unique(positions[distances <= k], return_index=True)
+        distances = distances[distances <= k][first]
+        ranked = np.lexsort((ids[positions], distances))
+        return [ids[positions][ranked], distances[ranked]]
+
+
+def block_spans(blocks):
+    """(shift, width) of each block, widths differ by at most one bit."""
+
+    if not 1 <= blocks <= 64:
+        raise ValueError("Number of blocks must be between 1 and 64")
+    spans, shift = [], 64
+    for i in range(blocks):
+        width = 64 // blocks + (i < 64 % blocks)
+        shift -= width
+        spans.append((shift, width))
+    return spans
+
+
+def key_dtype(width):
+    """Smallest unsigned numpy dtype for `width` bit block values."""
+
+    if width <= 16:
+        return np.uint16
+    return np.uint32 if width <= 32 else np.uint64
+
+
+@lru_cache(maxsize=None)
+def neighbor_masks(width, radius):
+    """XOR masks of all values within `radius` bits of a `width` bit value."""
+
+    masks = [0]
+    for r in range(1, min(radius, width) + 1):
+        for bits in combinations(range(width), r):
+            masks.append(sum(1 << b for b in bits))
+    return masks
+
+
+def neighbor_count(width, radius):
+    """Number of values within `radius` bits of a `width` bit value."""
+
+    return sum(
+        factorial(width) // (factorial(r) * factorial(width - r))
+        for r in range(min(radius, width) + 1)
+    )
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from typing import *
+
+class SimilarityIndex:
+    blocks: int
+    indexes: Dict[Optional[int], BodyIndex]
+    next_id: int
+    def __init__(self, blocks: int = ...) -> None: ...
+    def __len__(self) -> int: ...
+    def add(self, code: str, id: Optional[int] = None) -> int: ...
+    def add_many(
+        self, codes: Iterable[str], ids: Optional[Iterable[int]] = None
+    ) -> List[int]: ...
+    def remove(self, id: int) -> None: ...
+    def query(self, code: str, k: int) -> List[Any]: ...
+    def rebuild(self) -> None: ...
+
+class BodyIndex:
+    spans: List[Tuple[int, int]]
+    bodies: Any
+    ids: Any
+    alive: bytearray
+    deleted: int
+    indexed: int
+    tables: List[Any]
+    def __init__(self, blocks: int = ...) -> None: ...
+    def __len__(self) -> int: ...
+    def add_many(self, bodies: Sequence[int], ids: Sequence[int]) -> None: ...
+    def remove(self, id: int) -> bool: ...
+    def rebuild(self) -> None: ...
+    def query(self, body: int, k: int) -> List[Any]: ...
+
+def block_spans(blocks: int) -> List[Tuple[int, int]]: ...
+def key_dtype(width: int) -> Any: ...
+def neighbor_masks(width: int, radius: int) -> List[int]: ...
@@ -1,14 +1,30 @@
 # -*- coding: utf-8 -*-
 """ISCC Reference Implementation"""
 from binascii import hexlify
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate, chain, islice
 from statistics import median
+from array import array
+import codecs
 import math
-from io import BytesIO
+import re
+import sys
 from hashlib import sha256
 import unicodedata
 from PIL import Image
 import xxhash
 from iscc.const import *
+from iscc.readers import data_view, read_blocks, stream_readinto
+from iscc.minhash import MinHasher
+from iscc.image import image_hash_batch
+from iscc import cdc
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 
 ###############################################################################
@@ -18,25 +34,12 @@ from iscc.const import *
 
 def meta_id(title, extra=""):
 
-    # 1. Normalization
-    title_norm = text_normalize(title, keep_ws=True)
-    extra_norm = text_normalize(extra, keep_ws=True)
-
-    # 2. Trimming
-    title_trimmed = text_trim(title_norm)
-    extra_trimmed = text_trim(extra_norm)
-
-    # 3. Concatenate
-    concat = "\u0020".join((title_trimmed, extra_trimmed)).strip()
+    # 1. & 2. Normalization (only as far as needed for trimming) and trimming
+    title_trimmed = meta_trim(title)
+    extra_trimmed = meta_trim(extra)
 
-    # 4. Create a list of n-grams
-    n_grams = sliding_window(concat, width=WINDOW_SIZE_MID)
-
-    # 5. Encode n-grams and create xxhash64-digest
-    hash_digests = [xxhash.xxh64(s.encode("utf-8")).digest() for s in n_grams]
-
-    # 6. Apply similarity_hash
-    simhash_digest = similarity_hash(hash_digests)
+    # 3. - 6. Concatenate, hash n-grams and apply similarity_hash
+    simhash_digest = meta_simhash(title_trimmed, extra_trimmed)
 
     # 7. Prepend header-byte
     meta_id_digest = HEAD_MID + simhash_digest
@@ -48,19 +51,109 @@ def meta_id(title, extra=""):
     return [meta_id, title_trimmed, extra_trimmed]
 
 
-def content_id_text(text, partial=False):
+def meta_id_batch(titles, extras=None, workers=1, batch_size=META_BATCH_SIZE):
+    """
+    Meta-IDs of many records as columns `[digests, titles, extras]`.
+
+    `titles` is an iterable of titles or of (title, extra) rows, `extras` an
+    optional iterable of extras paired with `titles`. `digests` is an
+    `array("Q")` of the 64-bit Meta-ID bodies (see `meta_id_code`), `titles`
+    and `extras` are lists of the trimmed strings.
+    """
+
+    if extras is not None:
+        records = zip(titles, extras)
+    else:
+        records = ((r, "") if isinstance(r, (str, bytes)) else r for r in titles)
+    batches = iter(lambda: list(islice(records, batch_size)), [])
+
+    if workers > 1:
+        results = meta_id_records_parallel(batches, workers)
+    else:
+        results = map(meta_id_records, batches)
+
+    digests, title_column, extra_column = array("Q"), [], []
+    for batch_digests, batch_titles, batch_extras in results:
+        digests.extend(batch_digests)
+        title_column.extend(batch_titles)
+        extra_column.extend(batch_extras)
+
+    return [digests, title_column, extra_column]
+
+
+def meta_id_records(records):
+
+    digests, titles, extras = array("Q"), [], []
+    trimmed = {}
+    simhashes = {}
+
+    for title, extra in records:
+
+        # 1. & 2. Normalize and trim each distinct title and extra once
+        for value, column in ((title, titles), (extra, extras)):
+            if value not in trimmed:
+                trimmed[value] = meta_trim(value)
+            column.append(trimmed[value])
+
+        # 3. - 6. Similarity hash of each distinct trimmed pair once
+        key = (titles[-1], extras[-1])
+        if key not in simhashes:
+            simhashes[key] = int.from_bytes(meta_simhash(*key), "big")
+        digests.append(simhashes[key])
+
+    return digests, titles, extras
+
+
+def meta_id_records_parallel(batches, workers, max_pending=None):
+
+    # Batches are processed in worker processes, at most `max_pending` batches
+    # are queued so iterators over large catalogs are consumed lazily.
+    max_pending = max_pending or 2 * workers
+    pending = deque()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in batches:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(pool.submit(meta_id_records, batch))
+        for future in pending:
+            yield future.result()
+
+
+def meta_id_code(digest):
+
+    return encode(HEAD_MID + digest.to_bytes(8, "big", signed=False))
+
+
+def meta_trim(text):
+    """Steps 1. and 2. of `meta_id`: normalize as far as needed and trim."""
+
+    return text_trim(text_normalize_prefix(text, INPUT_TRIM, keep_ws=True))
+
+
+def meta_simhash(title_trimmed, extra_trimmed):
+    """Steps 3. to 6. of `meta_id`: 8 byte similarity hash of trimmed input."""
+
+    # 3. Concatenate
+    concat = "\u0020".join((title_trimmed, extra_trimmed)).strip()
+
+    # 4. & 5. Create xxhash64 digests of n-grams
+    hash_digests = big_endian(ngram_features(concat, WINDOW_SIZE_MID, bits=64))
+
+    # 6. Apply similarity_hash
+    return similarity_hash(hash_digests)
+
+
+def content_id_text(text, partial=False, signature=False):
 
     # 1. Normalize (drop whitespace)
     text = text_normalize(text, keep_ws=False)
 
-    # 2. Create 13 character n-grams
-    ngrams = ("\u0020".join(l) for l in sliding_window(text, WINDOW_SIZE_CID_T))
+    # 2. & 3. Create 32-bit features with xxHash32 of 13 character n-grams
+    features = ngram_features(text, WINDOW_SIZE_CID_T, sep="\u0020")
 
-    # 3. Create 32-bit features with xxHash32
-    features = (xxhash.xxh32(s.encode("utf-8")).intdigest() for s in ngrams)
-
-    # 4. Apply minimum_hash
-    minhash = minimum_hash(features, n=64)
+    # 4. Apply minimum_hash (streaming, numpy accelerated if available)
+    minhash = MinHasher(features, n=64).signature()
 
     # 5. Collect least significant bits of first 64 minhash signatures
     lsb = "".join([str(x & 1) for x in minhash])
@@ -74,17 +167,42 @@ def content_id_text(text, partial=False):
     else:
         content_id_text_digest = HEAD_CID_T + digest
 
-    # 8. Encode and return
-    return encode(content_id_text_digest)
+    # 8. Encode and return (with the full minhash signature if requested)
+    code = encode(content_id_text_digest)
+    return [code, minhash] if signature else code
+
+
+def content_id_text_stream(data, partial=False, signature=False):
 
+    # 1. Open paths in binary mode (decoded as UTF-8 like `content_id_text`)
+    if isinstance(data, str):
+        with open(data, "rb") as infile:
+            return content_id_text_stream(infile, partial, signature)
+
+    # 2. Feed blocks of text streams or chunks of iterables
+    hasher = TextIdHasher()
+    if hasattr(data, "read"):
+        for block in iter(lambda: data.read(TEXT_BLOCK_SIZE), data.read(0)):
+            hasher.update(block)
+    else:
+        for chunk in data:
+            hasher.update(chunk)
 
-def content_id_image(img, partial=False):
+    if signature:
+        return [hasher.code(partial), hasher.signature()]
+    return hasher.code(partial)
 
-    # 1. Normalize image to 2-dimensional pixel array
-    pixels = image_normalize(img)
 
-    # 2. Calculate image hash
-    hash_digest = image_hash(pixels)
+def content_id_image(img, partial=False, fast=False):
+
+    # 1. Normalize image to compact 32x32 pixel buffer
+    pixels = image_normalize(img, compact=True, fast=fast)
+
+    # 2. Calculate image hash (numpy accelerated if available)
+    if np:
+        hash_digest = image_hash_batch([pixels])[0]
+    else:
+        hash_digest = image_hash(pixels)
 
     # 3. Prepend the 1-byte component header
     if partial:
@@ -96,6 +214,47 @@ def content_id_image(img, partial=False):
     return encode(content_id_image_digest)
 
 
+def content_id_image_batch(
+    images, workers=None, partial=False, fast=False, batch_size=1024
+):
+
+    header = HEAD_CID_I_PCF if partial else HEAD_CID_I
+
+    def normalize(img):
+        try:
+            return image_normalize(img, compact=True, fast=fast)
+        except Exception as e:
+            return e
+
+    images = iter(images)
+    results = []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = list(islice(images, batch_size))
+            if not batch:
+                break
+
+            # 1. Decode and normalize on the thread pool (Pillow releases the GIL)
+            normalized = list(pool.map(normalize, batch))
+
+            # 2. Calculate image hashes of all normalized frames at once
+            frames = [p for p in normalized if not isinstance(p, Exception)]
+            if np and frames:
+                digests = iter(image_hash_batch(frames))
+            else:
+                digests = iter([image_hash(p) for p in frames])
+
+            # 3. Prepend header and encode, failed items keep their exception
+            for item in normalized:
+                if isinstance(item, Exception):
+                    results.append(item)
+                else:
+                    results.append(encode(header + next(digests)))
+
+    return results
+
+
 def content_id_mixed(cids, partial=False):
 
     # 1. Decode CIDs
@@ -117,13 +276,23 @@ def content_id_mixed(cids, partial=False):
     return encode(content_id_mixed_digest)
 
 
-def data_id(data):
+def data_id(data, signature=False):
+
+    if isinstance(data, str):
+        data = open(data, "rb")
+
+    with data_view(data) as view:
+        source = data if view is None else view
 
-    # 1. & 2. XxHash32 over CDC-Chunks
-    features = (xxhash.xxh32(chunk).intdigest() for chunk in data_chunks(data))
+        # 1. & 2. XxHash32 over CDC-Chunks (numpy accelerated if available)
+        if np:
+            chunks = cdc.cdc_chunks(source, views=True)
+        else:
+            chunks = data_chunks(source, views=True)
+        features = (xxhash.xxh32(chunk).intdigest() for chunk in chunks)
 
-    # 3. Apply minimum_hash
-    minhash = minimum_hash(features, n=64)
+        # 3. Apply minimum_hash (streaming, numpy accelerated if available)
+        minhash = MinHasher(features, n=64).signature()
 
     # 4. Collect least significant bits
     lsb = "".join([str(x & 1) for x in minhash])
@@ -134,28 +303,29 @@ def data_id(data):
     # 6. Prepend the 1-byte header
     data_id_digest = HEAD_DID + digest
 
-    # 7. Encode and return
-    return encode(data_id_digest)
+    # 7. Encode and return (with the full minhash signature if requested)
+    code = encode(data_id_digest)
+    return [code, minhash] if signature else code
 
 
-def instance_id(data):
+def instance_id(data, workers=1, max_pending=None):
 
     if isinstance(data, str):
         data = open(data, "rb")
 
-    if not hasattr(data, "read"):
-        data = BytesIO(data)
+    leaf_nodes = MerkleAccumulator()
 
-    leaf_node_digests = []
-
-    while True:
-        chunk = data.read(64000)
-        if chunk:
-            leaf_node_digests.append(sha256d(b"\x00" + chunk))
+    # Local files are memory mapped and hashed in place if possible
+    with data_view(data) as view:
+        source = data if view is None else view
+        if workers > 1:
+            for digest in leaf_digests_parallel(source, workers, max_pending):
+                leaf_nodes.add(digest)
         else:
-            break
+            for leaf in read_blocks(source, 64000, reuse=True):
+                leaf_nodes.add(leaf_digest(leaf))
 
-    top_hash_digest = top_hash(leaf_node_digests)
+    top_hash_digest = leaf_nodes.root()
     instance_id_digest = HEAD_IID + top_hash_digest[:8]
 
     code = encode(instance_id_digest)
@@ -164,6 +334,239 @@ def instance_id(data):
     return [code, hex_hash]
 
 
+def data_and_instance_id(data):
+
+    if isinstance(data, str):
+        data = open(data, "rb")
+
+    data_hasher = DataIdHasher()
+    instance_hasher = InstanceIdHasher()
+
+    # 1. Read the input once (memory mapped if possible) in blocks of whole leaves
+    with data_view(data) as view:
+        source = data if view is None else view
+        for block in read_blocks(source, 64000 * 16, reuse=True):
+
+            # 2. Feed the same block to Data-ID chunking and Instance-ID hashing
+            data_hasher.update(block)
+            instance_hasher.update(block)
+
+    # 3. Finalize and return Data-ID, Instance-ID and hex top hash
+    return [data_hasher.code(), instance_hasher.code(), instance_hasher.hexdigest()]
+
+
+###############################################################################
+# Incremental Hashers                                                         #
+###############################################################################
+
+
+class TextIdHasher:
+    """
+    Incremental Content-ID-Text computation over chunks of str or UTF-8 bytes.
+
+    Normalized text is produced by a `TextNormalizer` and the last 12
+    characters are carried across calls, so every 13 character n-gram of the
+    concatenated input is fed to the running `MinHasher` exactly once.
+    """
+
+    def __init__(self, text=None):
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.normalizer = TextNormalizer()
+        self.tail = ""
+        self.minhasher = MinHasher(n=64)
+        if text is not None:
+            self.update(text)
+
+    def update(self, text):
+
+        if not isinstance(text, str):
+            text = self.decoder.decode(text)
+        text = self.tail + self.normalizer.update(text)
+        if len(text) >= WINDOW_SIZE_CID_T:
+            self.minhasher.update(ngram_features(text, WINDOW_SIZE_CID_T, sep=" "))
+            text = text[1 - WINDOW_SIZE_CID_T :]
+        self.tail = text
+
+    def code(self, partial=False):
+
+        header = HEAD_CID_T_PCF if partial else HEAD_CID_T
+        return encode(header + self._final().digest())
+
+    def signature(self):
+        """Full minhash signature of the text so far."""
+
+        return self._final().signature()
+
+    def _final(self):
+
+        # Incomplete UTF-8 sequences fail like `content_id_text` does on bytes
+        bytes(self.decoder.getstate()[0]).decode("utf-8")
+
+        minhasher = self.minhasher.copy()
+        text = self.tail + self.normalizer.final()
+        # Normalized text shorter than one window is a single n-gram
+        if len(text) >= WINDOW_SIZE_CID_T or not minhasher.count:
+            minhasher.update(ngram_features(text, WINDOW_SIZE_CID_T, sep=" "))
+        return minhasher
+
+
+class DataIdHasher:
+    """
+    Incremental Data-ID computation with hashlib style `update` semantics.
+
+    Bytes after the last chunk boundary that can already be determined and the
+    number of chunks cut so far (GEAR1/GEAR2 switch) are carried across calls.
+    The gear pattern restarts with every chunk, so no further CDC state exists.
+    """
+
+    def __init__(self, data=None, block_size=cdc.CDC_BLOCK_SIZE):
+        self.block_size = block_size
+        self.buffer = bytearray()
+        self.counter = 0
+        self.minhasher = MinHasher(n=64)
+        if data is not None:
+            self.update(data)
+
+    def update(self, data):
+
+        view = memoryview(data).cast("B")
+        for i in range(0, len(view), self.block_size):
+            self.buffer += view[i : i + self.block_size]
+            if len(self.buffer) >= self.block_size:
+                consumed, self.counter = self._hash_chunks(self.minhasher, False)
+                del self.buffer[:consumed]
+
+    def code(self):
+
+        return encode(HEAD_DID + self._final().digest())
+
+    def signature(self):
+        """Full minhash signature of the data so far."""
+
+        return self._final().signature()
+
+    def _final(self):
+
+        minhasher = self.minhasher.copy()
+        self._hash_chunks(minhasher, True)
+        return minhasher
+
+    def _hash_chunks(self, minhasher, final):
+
+        sizes_func = cdc.cdc_sizes if np else chunk_sizes
+        window_size = self.block_size + GEAR2_MAX
+        view = memoryview(self.buffer)
+        start = 0
+        counter = self.counter
+        while True:
+            window = view[start : start + window_size]
+            last = final and start + len(window) == len(view)
+            sizes = sizes_func(window, counter, last)
+            if not sizes:
+                break
+            features = []
+            for size in sizes:
+                features.append(xxhash.xxh32(view[start : start + size]).intdigest())
+                start += size
+            minhasher.update(features)
+            counter += len(sizes)
+        view.release()
+        return start, counter
+
+
+class InstanceIdHasher:
+    """
+    Incremental Instance-ID computation with hashlib style `update` semantics.
+
+    Leaves are hashed as soon as 64000 bytes are complete and folded into a
+    `MerkleAccumulator`, so only a partial leaf and O(log n) digests are kept.
+    """
+
+    def __init__(self, data=None):
+        self.leaf = bytearray()
+        self.leaf_nodes = MerkleAccumulator()
+        if data is not None:
+            self.update(data)
+
+    def update(self, data):
+
+        view = memoryview(data).cast("B")
+        pos = 0
+
+        if self.leaf:
+            pos = min(64000 - len(self.leaf), len(view))
+            self.leaf += view[:pos]
+            if len(self.leaf) < 64000:
+                return
+            self.leaf_nodes.add(leaf_digest(self.leaf))
+            del self.leaf[:]
+
+        while len(view) - pos >= 64000:
+            self.leaf_nodes.add(leaf_digest(view[pos : pos + 64000]))
+            pos += 64000
+
+        self.leaf += view[pos:]
+
+    def digest(self):
+
+        leaf_nodes = self.leaf_nodes.copy()
+        if self.leaf:
+            leaf_nodes.add(leaf_digest(self.leaf))
+        return leaf_nodes.root()
+
+    def hexdigest(self):
+
+        return hexlify(self.digest()).decode("ascii")
+
+    def code(self):
+
+        return encode(HEAD_IID + self.digest()[:8])
+
+
+class MerkleAccumulator:
+    """
+    Streaming Merkle tree builder with the same result as `top_hash`.
+
+    Digests are folded into a stack of complete subtrees (at most one per
+    level), so O(log n) digests are held and no recursion is needed.
+    """
+
+    def __init__(self):
+        self.stack = []
+
+    def add(self, digest):
+
+        level = 0
+        while self.stack and self.stack[-1][0] == level:
+            digest = hash_inner_nodes(self.stack.pop()[1], digest)
+            level += 1
+        self.stack.append((level, digest))
+
+    def copy(self):
+
+        accumulator = MerkleAccumulator()
+        accumulator.stack = list(self.stack)
+        return accumulator
+
+    def root(self):
+
+        if not self.stack:
+            raise ValueError("Merkle tree requires at least one digest")
+
+        stack = list(self.stack)
+        level, digest = stack.pop()
+
+        # The last node of a level with an odd node count is paired with itself.
+        while stack:
+            if stack[-1][0] == level:
+                digest = hash_inner_nodes(stack.pop()[1], digest)
+            else:
+                digest = hash_inner_nodes(digest, digest)
+            level += 1
+
+        return digest
+
+
 ###############################################################################
 # Content Normalization Functions                                             #
 ###############################################################################
@@ -174,6 +577,29 @@ def text_trim(text):
     return text.encode("utf-8")[:INPUT_TRIM].decode("utf-8", "ignore").strip()
 
 
+class TextFilterTable(dict):
+    """
+    Lazy `str.translate` table for the character filter of `text_normalize`.
+
+    Maps codepoints of `UNICODE_FILTER` categories (except `CC_WHITESPACE`) to
+    None and all others to themselves. Entries are computed on first lookup,
+    so memory is bounded by the codepoints seen and repeated lookups happen
+    in C.
+    """
+
+    def __missing__(self, codepoint):
+        c = chr(codepoint)
+        if unicodedata.category(c) in UNICODE_FILTER and c not in CC_WHITESPACE:
+            value = None
+        else:
+            value = codepoint
+        self[codepoint] = value
+        return value
+
+
+TEXT_FILTER_TABLE = TextFilterTable()
+
+
 def text_normalize(text, keep_ws=False):
 
     # 1. Convert bytes to str
@@ -190,14 +616,7 @@ def text_normalize(text, keep_ws=False):
     text_decomposed = unicodedata.normalize("NFD", text_lower)
 
     # 5. Filter
-    chars = []
-    for c in text_decomposed:
-        cat = unicodedata.category(c)
-        if cat not in UNICODE_FILTER:
-            chars.append(c)
-        elif c in CC_WHITESPACE:
-            chars.append(c)
-    text_filtered = "".join(chars)
+    text_filtered = text_decomposed.translate(TEXT_FILTER_TABLE)
 
     # 6. Keep or remove whitespace (remove duplicate whitespace)
     if keep_ws:
@@ -211,21 +630,239 @@ def text_normalize(text, keep_ws=False):
     return recombined
 
 
-def image_normalize(img):
+class TextNormalizer:
+    """
+    Incremental `text_normalize` over chunks of text.
+
+    `update` returns the normalized text that can no longer change. Input is
+    cut at `raw_boundary` and lowered with the final sigma context of the text
+    before, and filtered text only before characters that cannot compose with
+    anything before them under NFKC. Everything after the last such cut is kept
+    for the next call.
+
+    With `keep_ws` whitespace runs are collapsed to single spaces, including
+    runs across calls, and leading/trailing whitespace is dropped.
+    """
+
+    def __init__(self, keep_ws=False):
+        self.keep_ws = keep_ws
+        self.started = False
+        self.cased = False
+        self.raw = ""
+        self.filtered = ""
+
+    def update(self, text):
+
+        raw = self.raw + text
+        cut = raw_boundary(raw, len(self.raw))
+        self.raw = raw[cut:]
+
+        filtered = self.filtered + self._filter(raw[:cut])
+        cut = text_boundary(filtered, is_nfkc_boundary, len(self.filtered))
+        self.filtered = filtered[cut:]
+
+        return unicodedata.normalize("NFKC", filtered[:cut])
+
+    def final(self):
+
+        filtered = self.filtered + self._filter(self.raw)
+        if self.keep_ws:
+            filtered = filtered.rstrip(" ")
+        return unicodedata.normalize("NFKC", filtered)
+
+    def _filter(self, text):
+
+        # A cased character before makes a leading capital sigma final
+        context = "A" if self.cased else ""
+        text_filtered = text_filter(context + text, self.keep_ws)[len(context) :]
+        for c in reversed(text):
+            cased = case_context(c)
+            if cased is not None:
+                self.cased = cased
+                break
+        if self.keep_ws and (not self.started or self.filtered.endswith(" ")):
+            text_filtered = text_filtered.lstrip(" ")
+        self.started = self.started or bool(text_filtered)
+        return text_filtered
+
+
+def text_normalize_prefix(text, size, keep_ws=False):
+    """
+    Prefix of `text_normalize(text, keep_ws)` with at least `size` UTF-8 bytes.
 
-    if not isinstance(img, Image.Image):
+    Normalizes incrementally and stops as soon as enough output is final, so
+    the cost depends on `size` instead of the length of `text`. Returns the
+    complete normalized text if it is shorter.
+    """
+
+    if isinstance(text, (bytes, bytearray, memoryview)):
+        text = memoryview(text).cast("B")
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        decode = decoder.decode
+    elif isinstance(text, str):
+        decoder = None
+        decode = str
+    else:
+        raise TypeError("Expected str or bytes-like text, got %s" % type(text).__name__)
+
+    normalizer = TextNormalizer(keep_ws)
+    prefix = []
+    length = 0
+    pos, block = 0, max(size, 1)
+    while pos < len(text):
+        # Growing blocks keep the work linear if boundaries are rare
+        chunk = normalizer.update(decode(text[pos : pos + block]))
+        prefix.append(chunk)
+        length += len(chunk.encode("utf-8"))
+        if length >= size:
+            return "".join(prefix)
+        pos += block
+        block *= 2
+
+    if decoder is not None:
+        decoder.decode(b"", final=True)
+    prefix.append(normalizer.final())
+    return "".join(prefix)
+
+
+def text_filter(text, keep_ws=False):
+    """Steps 3 to 6 of `text_normalize` without stripping whitespace."""
+
+    text_decomposed = unicodedata.normalize("NFD", text.lower())
+    text_filtered = text_decomposed.translate(TEXT_FILTER_TABLE)
+    if keep_ws:
+        return WHITESPACE_RUNS.sub(" ", text_filtered)
+    return "".join(text_filtered.split())
+
+
+# Matches the same whitespace as `str.split()`
+WHITESPACE_RUNS = re.compile(r"\s+")
+
+
+def text_boundary(text, predicate, start=0):
+    """Index of the last boundary character in `text[start:]` (0 if none)."""
+
+    for i in range(len(text) - 1, max(start, 1) - 1, -1):
+        if predicate(text[i]):
+            return i
+    return 0
+
+
+def raw_boundary(text, start=0):
+    """
+    Index of the last cut in `text[start:]` that `lower` and NFD do not see
+    (0 if none).
+
+    Cuts are only before characters that start with a combining class 0
+    character after NFD, and not after a capital sigma followed by nothing but
+    case-ignorable characters, as its final form depends on the text after it.
+    """
+
+    i = len(text) - 1
+    while i >= max(start, 1):
+        if unicodedata.combining(nfd_lower(text[i])[0]):
+            i -= 1
+            continue
+        j = i - 1
+        while j >= 0 and case_context(text[j]) is None:
+            j -= 1
+        if j < 0 or text[j] != "\u03a3":
+            return i
+        i = j
+    return 0
+
+
+@lru_cache(maxsize=None)
+def nfd_lower(c):
+
+    return unicodedata.normalize("NFD", c.lower())
+
+
+@lru_cache(maxsize=None)
+def case_context(c):
+    """True if cased, False if not and None if case-ignorable for final sigma."""
+
+    final = ("A\u03a3" + c).lower()[1] + ("A\u03a3" + c + "A").lower()[1]
+    return {"\u03c3\u03c3": True, "\u03c2\u03c2": False}.get(final)
+
+
+@lru_cache(maxsize=None)
+def is_nfkc_boundary(c):
+
+    decomposed = unicodedata.normalize("NFKD", c)[0]
+    if unicodedata.combining(decomposed):
+        return False
+    # Nothing below U+0300 composes with a preceding character (skips the scan)
+    return decomposed < "\u0300" or decomposed not in composition_seconds()
+
+
+@lru_cache(maxsize=None)
+def composition_seconds():
+    """Characters that may compose with a preceding character (NFC/NFKC)."""
+
+    seconds = set()
+    for cp in range(sys.maxunicode + 1):
+        decomposition = unicodedata.decomposition(chr(cp)).split()
+        if len(decomposition) == 2 and not decomposition[0].startswith("<"):
+            seconds.add(chr(int(decomposition[1], 16)))
+    # Hangul medial vowels and final consonants (algorithmic composition)
+    seconds.update(chr(cp) for cp in range(0x1161, 0x1176))
+    seconds.update(chr(cp) for cp in range(0x11A8, 0x11C3))
+    return frozenset(seconds)
+
+
+def image_normalize(img, compact=False, fast=False, size=None, mode="L"):
+
+    if size is not None:
+        img = image_frame(img, size, mode)
+    elif not isinstance(img, Image.Image):
         img = Image.open(img)
 
+        # Fast mode: let the JPEG decoder scale down to the smallest size >= 32x32
+        # (only for images opened here, `draft` changes the image in place)
+        if fast:
+            img.draft("L", (32, 32))
+
     # 1. Convert to greyscale
     img = img.convert("L")
 
+    # Fast mode: reduce by integer factors (box filter) before the final resize
+    if fast and hasattr(img, "reduce"):
+        reduce_size = FAST_REDUCE_SIZE
+        factors = (max(img.width // reduce_size, 1), max(img.height // reduce_size, 1))
+        if factors != (1, 1):
+            img = img.reduce(factors)
+
     # 2. Resize to 32x32
     img = img.resize((32, 32), Image.BICUBIC)
 
-    # 3. Create two dimensional array
-    pixels = [[list(img.getdata())[32 * i + j] for j in range(32)] for i in range(32)]
+    # 3. Extract contiguous row-major pixel buffer (1024 bytes)
+    pixels = img.tobytes()
+    if compact:
+        return pixels
 
-    return pixels
+    # 4. Create two dimensional array
+    return [list(pixels[32 * i : 32 * (i + 1)]) for i in range(32)]
+
+
+def image_frame(data, size, mode="L"):
+    """Wrap raw decoded pixels (buffer protocol object) of `size` as PIL image.
+
+    Contiguous frames of modes PIL can map (L, RGBA, CMYK, ...) are used
+    without copying. Other modes are decoded by PIL into a new image once,
+    only buffers PIL cannot decode from (not `bytes`) are copied before.
+    """
+
+    view = memoryview(data)
+    if view.c_contiguous and mode in IMAGE_MAP_MODES:
+        return Image.frombuffer(mode, tuple(size), view, "raw", mode, 0, 1)
+    if not isinstance(data, bytes):
+        data = view.tobytes()
+    return Image.frombytes(mode, tuple(size), data)
+
+
+# Modes `Image.frombuffer` maps onto the buffer with the "raw" decoder
+IMAGE_MAP_MODES = ("L", "P", "RGBX", "RGBA", "CMYK", "I;16", "I;16L", "I;16B")
 
 
 ###############################################################################
@@ -233,22 +870,90 @@ def image_normalize(img):
 ###############################################################################
 
 
-def similarity_hash(hash_digests):
+def ngram_features(text, width, bits=32, sep=""):
+    """
+    Hash the `width` character n-grams of `text` with xxHash32 or xxHash64.
+
+    Equals `xxh32(sep.join(ngram).encode("utf-8")).intdigest()` for each ngram of
+    `sliding_window(text, width)`, but encodes the text only once and hashes
+    windows of that buffer. Returns an `array("I")` or `array("Q")`.
+    """
+
+    typecode, intdigest = XXHASH_INTDIGEST[bits]
+    step = len(sep.encode("utf-8"))
+    data = sep.join(text).encode("utf-8")
+    count = len(text) - width + 1
+
+    # 1. Text shorter than one window is a single n-gram
+    if count <= 0:
+        return array(typecode, [intdigest(data)])
+
+    view = memoryview(data)
+    if len(data) == len(text) + step * (len(text) - 1):
+        # 2a. Single byte characters: fixed window stride and size
+        stride, size = 1 + step, width + step * (width - 1)
+        windows = (view[i : i + size] for i in range(0, count * stride, stride))
+    else:
+        # 2b. Multi byte characters: byte offsets of each character of `text`
+        if np:
+            leads = (np.frombuffer(data, dtype=np.uint8) & 0xC0) != 0x80
+            offsets = np.flatnonzero(leads)[:: len(sep) + 1].astype(np.uint64)
+            starts = array("Q", offsets.tobytes())
+            starts.append(len(data) + step)
+        else:
+            sizes = (
+                1 + (c >= "\x80") + (c >= "\u0800") + (c >= "\U00010000") + step
+                for c in text
+            )
+            starts = array("Q", accumulate(chain((0,), sizes)))
+        windows = (view[starts[i] : starts[i + width] - step] for i in range(count))
+
+    features = array(typecode, map(intdigest, windows))
+    view.release()
+    return features
 
-    n_bytes = len(hash_digests[0])
-    n_bits = n_bytes * 8
-    vector = [0] * n_bits
 
-    for digest in hash_digests:
+def big_endian(features):
+    """Byteswap an array of integer features in place to big endian digests."""
 
-        assert len(digest) == n_bytes
-        h = int.from_bytes(digest, "big", signed=False)
+    if sys.byteorder == "little":
+        features.byteswap()
+    return features
 
-        for i in range(n_bits):
-            vector[i] += h & 1
-            h >>= 1
 
-    minfeatures = len(hash_digests) * 1.0 / 2
+def _xxh32_intdigest(data):
+
+    return xxhash.xxh32(data).intdigest()
+
+
+def _xxh64_intdigest(data):
+
+    return xxhash.xxh64(data).intdigest()
+
+
+# One-shot intdigest functions are only available with xxhash >= 2
+XXHASH_INTDIGEST = {
+    32: ("I", getattr(xxhash, "xxh32_intdigest", _xxh32_intdigest)),
+    64: ("Q", getattr(xxhash, "xxh64_intdigest", _xxh64_intdigest)),
+}
+
+
+def similarity_hash(hash_digests, size=8):
+
+    # Sequences of digests are joined, buffers hold digests of `size` bytes each
+    try:
+        data = memoryview(hash_digests).cast("B")
+        n_bytes = size
+    except TypeError:
+        n_bytes = len(hash_digests[0])
+        assert all(len(digest) == n_bytes for digest in hash_digests)
+        data = b"".join(hash_digests)
+
+    assert len(data) % n_bytes == 0
+    n_bits = n_bytes * 8
+    vector = bit_counts(data, n_bytes)
+
+    minfeatures = len(data) // n_bytes * 1.0 / 2
     shash = 0
 
     for i in range(n_bits):
@@ -257,6 +962,35 @@ def similarity_hash(hash_digests):
     return shash.to_bytes(n_bytes, "big", signed=False)
 
 
+def bit_counts(data, n_bytes, block_size=SIMHASH_BLOCK_SIZE):
+    """
+    Count set bits per bit position over a buffer of big endian `n_bytes` digests.
+
+    Returns a list where index `i` counts bit `i` (least significant first).
+    Counts bit columns with `unpackbits` if numpy is available, otherwise
+    builds a histogram of byte values per byte position (strided slices
+    counted in C) and expands it to bit counts.
+    """
+
+    n_bits = n_bytes * 8
+
+    if np:
+        counts = np.zeros(n_bits, dtype=np.uint64)
+        matrix = np.frombuffer(data, dtype=np.uint8).reshape(-1, n_bytes)
+        for i in range(0, len(matrix), block_size):
+            counts += np.unpackbits(matrix[i : i + block_size], axis=1).sum(axis=0)
+        return counts[::-1].tolist()
+
+    counts = [0] * n_bits
+    for pos in range(n_bytes):
+        shift = (n_bytes - 1 - pos) * 8
+        for value, count in Counter(data[pos::n_bytes]).items():
+            for k in range(8):
+                if value >> k & 1:
+                    counts[shift + k] += count
+    return counts
+
+
 def minimum_hash(features, n=64):
     features = list(features)
     max_int64 = (1 << 64) - 1
@@ -270,6 +1004,11 @@ def minimum_hash(features, n=64):
 
 def image_hash(pixels):
 
+    # Accept compact row-major pixel buffers from image_normalize
+    if isinstance(pixels, (bytes, bytearray, memoryview)):
+        pixels = memoryview(pixels).cast("B").tolist()
+        pixels = [pixels[32 * i : 32 * (i + 1)] for i in range(32)]
+
     # 1. DCT per row
     dct_row_lists = []
     for pixel_list in pixels:
@@ -303,19 +1042,41 @@ def image_hash(pixels):
 
 def top_hash(hashes):
 
-    size = len(hashes)
-    if size == 1:
-        return hashes[0]
+    leaf_nodes = MerkleAccumulator()
+    for digest in hashes:
+        leaf_nodes.add(digest)
+    return leaf_nodes.root()
+
+
+def leaf_digest(data):
+
+    # Same as sha256d(b"\x00" + data) without copying the leaf
+    hasher = sha256(b"\x00")
+    hasher.update(data)
+    return sha256(hasher.digest()).digest()
+
 
-    pairwise_hashed = []
+def leaf_digests(data):
 
-    for i in range(0, len(hashes) - 1, 2):
-        pairwise_hashed.append(hash_inner_nodes(hashes[i], hashes[i + 1]))
+    data = memoryview(data)
+    return [leaf_digest(data[i : i + 64000]) for i in range(0, len(data), 64000)]
 
-    if size % 2 == 1:
-        pairwise_hashed.append(hash_inner_nodes(hashes[-1], hashes[-1]))
 
-    return top_hash(pairwise_hashed)
+def leaf_digests_parallel(data, workers, max_pending=None, leaves_per_task=16):
+
+    # hashlib releases the GIL while hashing large buffers, so leaf batches are
+    # hashed on a thread pool. At most `max_pending` batches are held in memory.
+    max_pending = max_pending or 2 * workers
+    task_size = 64000 * leaves_per_task
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for block in read_blocks(data, task_size):
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(leaf_digests, block))
+        for future in pending:
+            yield from future.result()
 
 
 def sha256d(data):
@@ -328,39 +1089,69 @@ def hash_inner_nodes(a, b):
     return sha256d(b"\x01" + a + b)
 
 
-def data_chunks(data):
+def data_chunks(data, views=False):
 
     if isinstance(data, str):
         data = open(data, "rb")
 
-    if not hasattr(data, "read"):
-        data = BytesIO(data)
+    # Chunks are cut from a reusable buffer (streams) or directly from a view on
+    # the input (bytes-like objects) without copying the remaining section.
+    if hasattr(data, "read"):
+        stream = data
+        buffer = memoryview(bytearray(DATA_BUFFER_SIZE))
+        end = 0
+    else:
+        stream = None
+        buffer = memoryview(data).cast("B")
+        end = len(buffer)
 
-    section = data.read(GEAR1_MAX)
+    start = 0
     counter = 0
     while True:
         if counter < 100:
-            if len(section) < GEAR1_MAX:
-                section += data.read(GEAR1_MAX)
-            if len(section) == 0:
-                break
-            boundary = chunk_length(
-                section, GEAR1_NORM, GEAR1_MIN, GEAR1_MAX, GEAR1_MASK1, GEAR1_MASK2
-            )
+            params = GEAR1_NORM, GEAR1_MIN, GEAR1_MAX, GEAR1_MASK1, GEAR1_MASK2
         else:
-            if len(section) < GEAR2_MAX:
-                section += data.read(GEAR2_MAX)
-            if len(section) == 0:
-                break
-            boundary = chunk_length(
-                section, GEAR2_NORM, GEAR2_MIN, GEAR2_MAX, GEAR2_MASK1, GEAR2_MASK2
-            )
+            params = GEAR2_NORM, GEAR2_MIN, GEAR2_MAX, GEAR2_MASK1, GEAR2_MASK2
+
+        while stream is not None and end - start < params[2]:
+            if end == len(buffer):
+                buffer[: end - start] = buffer[start:end]
+                start, end = 0, end - start
+            size = stream_readinto(stream, buffer[end:])
+            if not size:
+                stream = None
+            end += size
+
+        if start == end:
+            break
 
-        yield section[:boundary]
-        section = section[boundary:]
+        boundary = chunk_length(buffer[start:end], *params)
+        chunk = buffer[start : start + boundary]
+        # Yielded views are only valid until the next chunk is requested.
+        yield chunk if views else chunk.tobytes()
+        start += boundary
         counter += 1
 
 
+def chunk_sizes(data, counter=0, final=True):
+
+    data = memoryview(data).cast("B")
+    sizes = []
+    start = 0
+    while start < len(data):
+        if counter < 100:
+            params = GEAR1_NORM, GEAR1_MIN, GEAR1_MAX, GEAR1_MASK1, GEAR1_MASK2
+        else:
+            params = GEAR2_NORM, GEAR2_MIN, GEAR2_MAX, GEAR2_MASK1, GEAR2_MASK2
+        if len(data) - start < params[2] and not final:
+            break
+        size = chunk_length(data[start:], *params)
+        sizes.append(size)
+        start += size
+        counter += 1
+    return sizes
+
+
 def chunk_length(data, norm_size, min_size, max_size, mask_1, mask_2):
 
     data_length = len(data)
@@ -438,47 +1229,57 @@ def distance(a, b):
 
 def encode(digest):
 
-    if len(digest) == 9:
-        return encode(digest[:1]) + encode(digest[1:])
-    assert len(digest) in (1, 8), "Digest must be 1, 8 or 9 bytes long"
-    digest = reversed(digest)
-    value = 0
-    numvalues = 1
-    for octet in digest:
-        octet *= numvalues
-        value += octet
-        numvalues *= 256
-    chars = []
-    while numvalues > 0:
-        chars.append(value % 58)
-        value //= 58
-        numvalues //= 58
-    return str.translate("".join([chr(c) for c in reversed(chars)]), V2CTABLE)
+    n = len(digest)
+    pairs = SYMBOL_PAIRS
+    if n == 1:
+        return pairs[digest[0]]
+    if n == 9:
+        header, digest = pairs[digest[0]], digest[1:]
+    else:
+        assert n == 8, "Digest must be 1, 8 or 9 bytes long"
+        header = ""
+
+    # 64-bit value as 1 + 5 * 2 base58 digits via the pair lookup table
+    value = int.from_bytes(digest, "big", signed=False)
+    value, e = divmod(value, 3364)
+    value, d = divmod(value, 3364)
+    value, c = divmod(value, 3364)
+    value, b = divmod(value, 3364)
+    value, a = divmod(value, 3364)
+    body = SYMBOLS[value] + pairs[a] + pairs[b] + pairs[c] + pairs[d] + pairs[e]
+    return header + body
 
 
 def decode(code):
 
     n = len(code)
-    if n == 13:
-        return decode(code[:2]) + decode(code[2:])
-    if n == 2:
-        bit_length = 8
-    elif n == 11:
-        bit_length = 64
-    else:
+    if n not in (2, 11, 13):
         raise ValueError("Code must be 2, 11 or 13 chars. Not %s" % n)
-    code = reversed(str.translate(code, C2VTABLE))
+
+    try:
+        pairs = SYMBOL_PAIR_VALUES
+        header = b"" if n == 11 else bytes((pairs[code[:2]] & 0xFF,))
+        if n == 2:
+            return header
+        # 64-bit value from 1 + 5 * 2 base58 digits via the pair lookup table
+        b = code[-11:]
+        value = SYMBOL_VALUES[b[0]] * 3364 + pairs[b[1:3]]
+        value = (value * 3364 + pairs[b[3:5]]) * 3364 + pairs[b[5:7]]
+        value = (value * 3364 + pairs[b[7:9]]) * 3364 + pairs[b[9:11]]
+    except KeyError:
+        # Unknown symbols keep their ordinal as digit (like `str.translate`)
+        return decode_fallback(code)
+
+    # Values beyond 64 bits wrap around like the byte extraction of the original
+    return header + (value & MAX_INT64).to_bytes(8, "big", signed=False)
+
+
+def decode_fallback(code):
+
+    if len(code) == 13:
+        return decode_fallback(code[:2]) + decode_fallback(code[2:])
     value = 0
-    numvalues = 1
-    for c in code:
-        c = ord(c)
-        c *= numvalues
-        value += c
-        numvalues *= 58
-    numvalues = 2 ** bit_length
-    data = []
-    while numvalues > 1:
-        data.append(value % 256)
-        value //= 256
-        numvalues //= 256
-    return bytes(reversed(data))
+    for c in str.translate(code, C2VTABLE):
+        value = value * 58 + ord(c)
+    n_bytes = 1 if len(code) == 2 else 8
+    return (value % 256 ** n_bytes).to_bytes(n_bytes, "big", signed=False)
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
+import array
+import codecs
 from typing import *
 from PIL import Image
 from io import BytesIO
+from iscc.minhash import MinHasher
 
 B = TypeVar("B", str, BinaryIO, bytes)
 IMG = TypeVar("I", str, BytesIO, Image.Image)
@@ -11,35 +14,168 @@ TEXT = TypeVar("TEXT", str, bytes)
 def meta_id(
     title: Union[str, bytes], extra: Union[str, bytes] = ""
 ) -> Tuple[str, str, str]: ...
-def content_id_text(text: Union[str, bytes], partial=False) -> str: ...
-def content_id_image(img: IMG, partial: bool = False) -> str: ...
+def meta_id_batch(
+    titles: Iterable[Union[str, bytes, Sequence[Union[str, bytes]]]],
+    extras: Optional[Iterable[Union[str, bytes]]] = None,
+    workers: int = 1,
+    batch_size: int = ...,
+) -> List[Union[array.array, List[str]]]: ...
+def meta_id_records(
+    records: Iterable[Tuple[Union[str, bytes], Union[str, bytes]]]
+) -> Tuple[array.array, List[str], List[str]]: ...
+def meta_id_records_parallel(
+    batches: Iterable[List[Tuple[Union[str, bytes], Union[str, bytes]]]],
+    workers: int,
+    max_pending: Optional[int] = None,
+) -> Iterator[Tuple[array.array, List[str], List[str]]]: ...
+def meta_id_code(digest: int) -> str: ...
+def meta_trim(text: TEXT) -> str: ...
+def meta_simhash(title_trimmed: str, extra_trimmed: str) -> bytes: ...
+def content_id_text(
+    text: Union[str, bytes], partial=False, signature: bool = False
+) -> Union[str, Tuple[str, List[int]]]: ...
+def content_id_text_stream(
+    data: Union[str, BinaryIO, TextIO, Iterable[Union[str, bytes]]],
+    partial: bool = False,
+    signature: bool = False,
+) -> Union[str, Tuple[str, List[int]]]: ...
+def content_id_image(img: IMG, partial: bool = False, fast: bool = False) -> str: ...
+def content_id_image_batch(
+    images: Iterable[IMG],
+    workers: Optional[int] = None,
+    partial: bool = False,
+    fast: bool = False,
+    batch_size: int = 1024,
+) -> List[Union[str, Exception]]: ...
 def content_id_mixed(cids: List[str], partial: bool = False) -> str: ...
-def data_id(data: B) -> str: ...
-def instance_id(data: B) -> Tuple[str, str]: ...
+def data_id(data: B, signature: bool = False) -> Union[str, Tuple[str, List[int]]]: ...
+def instance_id(
+    data: B, workers: int = 1, max_pending: Optional[int] = None
+) -> Tuple[str, str]: ...
+def data_and_instance_id(data: B) -> Tuple[str, str, str]: ...
+
+# Incremental Hashers
+class TextIdHasher:
+    decoder: codecs.IncrementalDecoder
+    normalizer: TextNormalizer
+    tail: str
+    minhasher: MinHasher
+    def __init__(self, text: Optional[Union[str, ByteString]] = None) -> None: ...
+    def update(self, text: Union[str, ByteString]) -> None: ...
+    def code(self, partial: bool = False) -> str: ...
+    def signature(self) -> List[int]: ...
+
+class DataIdHasher:
+    block_size: int
+    buffer: bytearray
+    counter: int
+    def __init__(
+        self, data: Optional[ByteString] = None, block_size: int = ...
+    ) -> None: ...
+    def update(self, data: ByteString) -> None: ...
+    def code(self) -> str: ...
+    def signature(self) -> List[int]: ...
+
+class InstanceIdHasher:
+    leaf: bytearray
+    leaf_nodes: "MerkleAccumulator"
+    def __init__(self, data: Optional[ByteString] = None) -> None: ...
+    def update(self, data: ByteString) -> None: ...
+    def digest(self) -> bytes: ...
+    def hexdigest(self) -> str: ...
+    def code(self) -> str: ...
+
+class MerkleAccumulator:
+    stack: List[Tuple[int, bytes]]
+    def __init__(self) -> None: ...
+    def add(self, digest: bytes) -> None: ...
+    def copy(self) -> "MerkleAccumulator": ...
+    def root(self) -> bytes: ...
 
 # Content Normalization
 def text_pre_normalize(text: TEXT) -> str: ...
 def text_trim(text: str) -> str: ...
+class TextFilterTable(Dict[int, Optional[int]]):
+    def __missing__(self, codepoint: int) -> Optional[int]: ...
+
+TEXT_FILTER_TABLE: TextFilterTable
+
 def text_normalize(text: str, keep_ws: bool = False) -> str: ...
-def image_normalize(img: IMG) -> List[List[int]]: ...
+class TextNormalizer:
+    keep_ws: bool
+    started: bool
+    cased: bool
+    raw: str
+    filtered: str
+    def __init__(self, keep_ws: bool = False) -> None: ...
+    def update(self, text: str) -> str: ...
+    def final(self) -> str: ...
+
+def text_normalize_prefix(text: TEXT, size: int, keep_ws: bool = False) -> str: ...
+def text_filter(text: str, keep_ws: bool = False) -> str: ...
+
+WHITESPACE_RUNS: Pattern[str]
+
+def text_boundary(
+    text: str, predicate: Callable[[str], bool], start: int = 0
+) -> int: ...
+def raw_boundary(text: str, start: int = 0) -> int: ...
+def nfd_lower(c: str) -> str: ...
+def case_context(c: str) -> Optional[bool]: ...
+def is_nfkc_boundary(c: str) -> bool: ...
+def composition_seconds() -> FrozenSet[str]: ...
+def image_normalize(
+    img: Union[IMG, Any],
+    compact: bool = False,
+    fast: bool = False,
+    size: Optional[Tuple[int, int]] = None,
+    mode: str = "L",
+) -> Union[List[List[int]], bytes]: ...
+def image_frame(data: Any, size: Tuple[int, int], mode: str = "L") -> Image.Image: ...
+
+IMAGE_MAP_MODES: Tuple[str, ...]
 
 # Feature Hashing
-def similarity_hash(hash_digests: Sequence[ByteString]) -> bytes: ...
+def ngram_features(
+    text: str, width: int, bits: int = 32, sep: str = ""
+) -> array.array: ...
+
+def big_endian(features: array.array) -> array.array: ...
+
+XXHASH_INTDIGEST: Dict[int, Tuple[str, Callable[[ByteString], int]]]
+
+def similarity_hash(
+    hash_digests: Union[Sequence[ByteString], ByteString], size: int = 8
+) -> bytes: ...
+def bit_counts(data: ByteString, n_bytes: int, block_size: int = ...) -> List[int]: ...
 def minimum_hash(features: Iterable[int], n: int = 64) -> List[int]: ...
-def image_hash(pixels: List[List[int]]) -> bytes: ...
+def image_hash(pixels: Union[Sequence[Sequence[int]], ByteString]) -> bytes: ...
 
 # Content-ID-Image utils
 def dct(value_list: Sequence[float]) -> Sequence[float]: ...
 
 # Data-ID utils
-def data_chunks(data: B) -> Generator[bytes, None, None]: ...
+def data_chunks(
+    data: B, views: bool = False
+) -> Generator[Union[bytes, memoryview], None, None]: ...
+def chunk_sizes(
+    data: ByteString, counter: int = 0, final: bool = True
+) -> List[int]: ...
 def chunk_length(
     data: bytes, norm_size: int, min_size: int, max_size: int, mask_1: int, mask_2: int
 ) -> int: ...
 
 # Instance-ID helpers
+def leaf_digest(data: ByteString) -> bytes: ...
+def leaf_digests(data: ByteString) -> List[bytes]: ...
+def leaf_digests_parallel(
+    data: Union[memoryview, BinaryIO],
+    workers: int,
+    max_pending: Optional[int] = None,
+    leaves_per_task: int = 16,
+) -> Generator[bytes, None, None]: ...
 def sha256d(data: bytes) -> bytes: ...
-def top_hash(hashes: List[bytes]) -> bytes: ...
+def top_hash(hashes: Iterable[bytes]) -> bytes: ...
 def hash_inner_nodes(a: bytes, b: bytes) -> bytes: ...
 
 # Common untility functions
@@ -47,3 +183,4 @@ def sliding_window(seq: Sequence, width: int) -> List: ...
 def distance(a: Union[int, str, bytes], b: Union[int, str, bytes]) -> int: ...
 def encode(digest: bytes) -> str: ...
 def decode(code: str) -> bytes: ...
+def decode_fallback(code: str) -> bytes: ...
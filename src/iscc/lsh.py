@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""LSH banding index over full minhash signatures
+
+The 64-bit Content-ID-Text and Data-ID only keep the least significant bit of
+each minimum hash. `content_id_text(..., signature=True)` and
+`data_id(..., signature=True)` also return the full signature. `MinHashLSH`
+indexes such signatures in `bands` hash tables keyed by `rows` consecutive
+minimum hashes. Two signatures are candidates if all rows of any band are
+equal, which happens with probability `1 - (1 - s ** rows) ** bands` for
+Jaccard similarity `s`. Candidates are re-ranked by the fraction of equal
+minimum hashes (estimated Jaccard similarity) over the full signatures.
+"""
+
+from array import array
+from iscc.const import *
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class MinHashLSH:
+    """
+    Index of minhash signatures for Jaccard similarity candidate retrieval.
+
+    Signatures are lists of `n` 32-bit minimum hashes stored under integer
+    ids, by default consecutive numbers in insertion order. The first
+    `bands * rows` minimum hashes are used for banding.
+    """
+
+    def __init__(self, bands=LSH_BANDS, rows=LSH_ROWS, n=64):
+        if bands < 1 or rows < 1 or bands * rows > n:
+            raise ValueError("bands * rows must be between 1 and %d" % n)
+        self.bands = bands
+        self.rows = rows
+        self.n = n
+        self.tables = [{} for _ in range(bands)]
+        self.signatures = array("I")
+        self.ids = array("Q")
+        self.positions = {}
+        self.next_id = 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def add(self, signature, id=None):
+
+        return self.add_many([signature], None if id is None else [id])[0]
+
+    def add_many(self, signatures, ids=None):
+
+        signatures = [self._check(signature) for signature in signatures]
+        if ids is None:
+            ids = list(range(self.next_id, self.next_id + len(signatures)))
+        else:
+            ids = list(ids)
+            if len(ids) != len(signatures):
+                raise ValueError("Signatures and ids must have the same length")
+        if len(set(ids)) != len(ids) or not self.positions.keys().isdisjoint(ids):
+            raise ValueError("Ids must be unique")
+        if ids:
+            self.next_id = max(self.next_id, max(ids) + 1)
+
+        for signature, id in zip(signatures, ids):
+            self._insert(signature, id)
+        return ids
+
+    def remove(self, id):
+
+        position = self.positions.pop(id)
+        signature = self.signatures[position * self.n : (position + 1) * self.n]
+        for table, key in zip(self.tables, self._band_keys(signature)):
+            bucket = table[key]
+            bucket.remove(position)
+            if not bucket:
+                del table[key]
+        if len(self.positions) < len(self.ids) // 2:
+            self.rebuild()
+
+    def rebuild(self):
+        """Drop the storage of removed signatures and rebuild the band tables."""
+
+        signatures, ids = self.signatures, self.ids
+        live = sorted(self.positions.values())
+        self.tables = [{} for _ in range(self.bands)]
+        self.signatures = array("I")
+        self.ids = array("Q")
+        self.positions = {}
+        for position in live:
+            start = position * self.n
+            self._insert(signatures[start : start + self.n], ids[position])
+
+    def candidates(self, signature):
+        """Positions of signatures sharing at least one band with `signature`."""
+
+        signature = self._check(signature)
+        positions = set()
+        for table, key in zip(self.tables, self._band_keys(signature)):
+            positions.update(table.get(key, ()))
+        return sorted(positions)
+
+    def query(self, signature, threshold=0.0, limit=None):
+        """Ids and estimated Jaccard similarities of candidates, most similar first."""
+
+        signature = self._check(signature)
+        positions = self.candidates(signature)
+
+        # 1. Fraction of equal minimum hashes over the full signatures
+        if np is not None and positions:
+            matrix = np.frombuffer(self.signatures, dtype=np.uint32)
+            matrix = matrix.reshape(-1, self.n)[positions]
+            query = np.asarray(signature, dtype=np.uint32)
+            equal = (matrix == query).sum(axis=1).tolist()
+            del matrix
+        else:
+            equal = []
+            for position in positions:
+                start = position * self.n
+                stored = self.signatures[start : start + self.n]
+                equal.append(sum(a == b for a, b in zip(stored, signature)))
+
+        # 2. Filter by threshold, rank by similarity and id
+        ranked = sorted(
+            (-count, self.ids[position])
+            for position, count in zip(positions, equal)
+            if count >= threshold * self.n
+        )
+        ranked = ranked[:limit]
+        return [[id for _, id in ranked], [-neg / self.n for neg, _ in ranked]]
+
+    def _insert(self, signature, id):
+
+        position = len(self.ids)
+        self.signatures.extend(signature)
+        self.ids.append(id)
+        self.positions[id] = position
+        for table, key in zip(self.tables, self._band_keys(signature)):
+            table.setdefault(key, []).append(position)
+
+    def _check(self, signature):
+
+        if len(signature) != self.n:
+            raise ValueError("Signatures must have %d minimum hashes" % self.n)
+        return signature
+
+    def _band_keys(self, signature):
+
+        data = array("I", signature).tobytes()
+        width = 4 * self.rows
+        return [data[i * width : (i + 1) * width] for i in range(self.bands)]
+
+
+def lsh_probability(similarity, bands=LSH_BANDS, rows=LSH_ROWS):
+
+    return 1 - (1 - similarity ** rows) ** bands
+
+
+def lsh_threshold(bands=LSH_BANDS, rows=LSH_ROWS):
+    """Jaccard similarity where candidate probability rises most steeply."""
+
+    return (1 / bands) ** (1 / rows)
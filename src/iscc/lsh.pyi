@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from typing import *
+
+class MinHashLSH:
+    bands: int
+    rows: int
+    n: int
+    tables: List[Dict[bytes, List[int]]]
+    signatures: Any
+    ids: Any
+    positions: Dict[int, int]
+    next_id: int
+    def __init__(self, bands: int = ..., rows: int = ..., n: int = 64) -> None: ...
+    def __len__(self) -> int: ...
+    def add(self, signature: Sequence[int], id: Optional[int] = None) -> int: ...
+    def add_many(
+        self,
+        signatures: Iterable[Sequence[int]],
+        ids: Optional[Iterable[int]] = None,
+    ) -> List[int]: ...
+    def remove(self, id: int) -> None: ...
+    def rebuild(self) -> None: ...
+    def candidates(self, signature: Sequence[int]) -> List[int]: ...
+    def query(
+        self,
+        signature: Sequence[int],
+        threshold: float = 0.0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[int], List[float]]: ...
+
+def lsh_probability(similarity: float, bands: int = ..., rows: int = ...) -> float: ...
+def lsh_threshold(bands: int = ..., rows: int = ...) -> float: ...
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Streaming and vectorized MinHash
+
+`MinHasher` accumulates signatures with constant memory. If numpy is available
+all `MINHASH_PERMUTATIONS` are evaluated over blocks of features at once with
+the same results as the reference `minimum_hash`.
+"""
+from itertools import islice
+from iscc.const import *
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+MINHASH_BLOCK_SIZE = 2 ** 13
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+class MinHasher:
+    """
+    Incremental MinHash accumulator.
+
+    Only the `n` running minima are kept, so features can be fed from
+    generators over arbitrarily large inputs with constant memory. Features
+    are hashed in blocks of `block_size`.
+    """
+
+    def __init__(self, features=None, n=64, block_size=MINHASH_BLOCK_SIZE):
+        self.n = n
+        self.block_size = block_size
+        self.count = 0
+        self.minima = [MAX_HASH + 1] * n
+        if features is not None:
+            self.update(features)
+
+    def update(self, features):
+
+        if np is not None:
+            minima = np.array(self.minima, dtype=np.uint64)
+            for block in feature_blocks(features, self.block_size):
+                np.minimum(minima, minhash_block(block, self.n), out=minima)
+                self.count += len(block)
+            self.minima = minima.tolist()
+            return
+
+        # Minimum per permutation over each block like `minimum_hash`
+        permutations = MINHASH_PERMUTATIONS[: self.n]
+        features = iter(features)
+        block = list(islice(features, self.block_size))
+        while block:
+            block_minima = [
+                min(
+                    (((a * f + b) & MAX_INT64) % MERSENNE_PRIME) & MAX_HASH
+                    for f in block
+                )
+                for a, b in permutations
+            ]
+            self.minima = list(map(min, self.minima, block_minima))
+            self.count += len(block)
+            block = list(islice(features, self.block_size))
+
+    def copy(self):
+
+        hasher = MinHasher(n=self.n, block_size=self.block_size)
+        hasher.count = self.count
+        hasher.minima = list(self.minima)
+        return hasher
+
+    def signature(self):
+
+        if not self.count:
+            raise ValueError("MinHasher requires at least one feature")
+        return list(self.minima)
+
+    def digest(self):
+        """Least significant bits of the signature packed into bytes."""
+
+        lsb = "".join([str(x & 1) for x in self.signature()])
+        return int(lsb, 2).to_bytes((self.n + 7) // 8, "big", signed=False)
+
+
+def minhash_block(features, n=64):
+    """
+    Return the `n` minimum hashes of a block of features as uint64 array.
+
+    Emulates `(((a * f + b) & MAX_INT64) % MERSENNE_PRIME) & MAX_HASH` exactly:
+    uint64 arithmetic wraps at 2**64 and the modulo is replaced by the
+    equivalent mersenne reduction `(x & p) + (x >> 61)` with one conditional
+    subtraction of `p`.
+    """
+
+    a, b = MINHASH_PERMUTATIONS_NP
+    features = np.asarray(features, dtype=np.uint64)
+    hashes = np.multiply(a[:n, None], features[None, :])
+    hashes += b[:n, None]
+    reduced = hashes >> np.uint64(61)
+    hashes &= np.uint64(MERSENNE_PRIME)
+    hashes += reduced
+    hashes[hashes >= np.uint64(MERSENNE_PRIME)] -= np.uint64(MERSENNE_PRIME)
+    hashes &= np.uint64(MAX_HASH)
+    return hashes.min(axis=1)
+
+
+def feature_blocks(features, block_size=MINHASH_BLOCK_SIZE):
+    """Yield uint64 arrays of at most `block_size` features."""
+
+    if hasattr(features, "__len__") and hasattr(features, "__getitem__"):
+        for i in range(0, len(features), block_size):
+            yield np.asarray(features[i : i + block_size], dtype=np.uint64)
+    else:
+        features = iter(features)
+        while True:
+            block = np.fromiter(islice(features, block_size), dtype=np.uint64)
+            if not len(block):
+                break
+            yield block
+
+
+MINHASH_PERMUTATIONS_NP = (
+    tuple(np.array(x, dtype=np.uint64) for x in zip(*MINHASH_PERMUTATIONS))
+    if np
+    else None
+)
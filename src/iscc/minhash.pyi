@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from typing import *
+
+MINHASH_BLOCK_SIZE: int
+MERSENNE_PRIME: int
+MAX_HASH: int
+
+class MinHasher:
+    n: int
+    block_size: int
+    count: int
+    minima: List[int]
+    def __init__(
+        self,
+        features: Optional[Iterable[int]] = None,
+        n: int = 64,
+        block_size: int = MINHASH_BLOCK_SIZE,
+    ) -> None: ...
+    def update(self, features: Iterable[int]) -> None: ...
+    def copy(self) -> "MinHasher": ...
+    def signature(self) -> List[int]: ...
+    def digest(self) -> bytes: ...
+
+def minhash_block(features: Sequence[int], n: int = 64) -> Any: ...
+def feature_blocks(
+    features: Iterable[int], block_size: int = MINHASH_BLOCK_SIZE
+) -> Generator[Any, None, None]: ...
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Stream reading helpers for buffer reusing (zero-copy) data processing"""
+import os
+import io
+import mmap
+import stat
+from contextlib import contextmanager
+
+
+@contextmanager
+def data_view(data):
+    """
+    Provide a zero-copy memoryview of `data` where possible.
+
+    Bytes-like objects are viewed directly, in-memory streams via their buffer
+    and local files (open binary files) are memory mapped read-only from the
+    current position. Yields None for anything else (pipes, sockets, empty
+    files) so callers can fall back to buffered reading.
+    """
+
+    if not hasattr(data, "read"):
+        view = memoryview(data).cast("B")
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+
+    mapped = buffer = None
+    try:
+        if isinstance(data, io.BytesIO):
+            buffer = data.getbuffer()
+        elif stat.S_ISREG(os.fstat(data.fileno()).st_mode):
+            mapped = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = memoryview(mapped)
+        offset = data.tell()
+    except (AttributeError, OSError, ValueError):
+        # Not mappable (io.UnsupportedOperation is an OSError and a ValueError)
+        buffer = None
+
+    if buffer is None:
+        yield None
+        return
+
+    view = buffer[offset:]
+    try:
+        yield view
+    finally:
+        view.release()
+        buffer.release()
+        data.seek(0, os.SEEK_END)
+        if mapped is not None:
+            try:
+                mapped.close()
+            except BufferError:  # pragma: no cover
+                pass  # views kept by the caller, the map is closed on collection
+
+
+def read_blocks(data, size, reuse=False):
+    """
+    Yield consecutive blocks of `size` bytes from a memoryview or a stream.
+
+    Blocks of a memoryview are zero-copy slices. Stream blocks are read with
+    `readinto`, either into one reused buffer (`reuse=True`, each block is
+    only valid until the next one is requested) or into a fresh buffer per
+    block. Only the last block may be shorter than `size`.
+    """
+
+    if isinstance(data, memoryview):
+        for i in range(0, len(data), size):
+            yield data[i : i + size]
+        return
+
+    buffer = memoryview(bytearray(size)) if reuse else None
+    while True:
+        view = buffer if reuse else memoryview(bytearray(size))
+        filled = stream_fill(data, view)
+        if not filled:
+            break
+        yield view[:filled]
+        if filled < size:
+            break
+
+
+def stream_readinto(stream, view):
+    """
+    Read up to `len(view)` bytes from `stream` directly into `view`.
+
+    Uses `readinto` where available so that no intermediate bytes object is
+    allocated and falls back to `read` for minimal file-like objects. Returns
+    the number of bytes read (0 at end of stream).
+    """
+
+    if hasattr(stream, "readinto"):
+        return stream.readinto(view) or 0
+    block = stream.read(len(view))
+    view[: len(block)] = block
+    return len(block)
+
+
+def stream_fill(stream, view):
+    """Read from `stream` until `view` is full or the stream is exhausted."""
+
+    filled = 0
+    while filled < len(view):
+        size = stream_readinto(stream, view[filled:])
+        if not size:
+            break
+        filled += size
+    return filled
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+from typing import *
+
+def data_view(
+    data: Union[ByteString, BinaryIO]
+) -> ContextManager[Optional[memoryview]]: ...
+def read_blocks(
+    data: Union[memoryview, BinaryIO], size: int, reuse: bool = False
+) -> Generator[memoryview, None, None]: ...
+def stream_readinto(stream: BinaryIO, view: memoryview) -> int: ...
+def stream_fill(stream: BinaryIO, view: memoryview) -> int: ...
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+import random
+import iscc
+
+
+def random_codes(n, headers, flips):
+    """`n` codes with `headers` in turn, up to `flips` bits off a common body."""
+    random.seed(23)
+    base = random.getrandbits(64)
+    codes = []
+    for i in range(n):
+        # Flip a few random bits of the base body to get small distances too
+        value = base
+        for _ in range(random.randint(0, flips)):
+            value ^= 1 << random.randrange(64)
+        header = headers[i % len(headers)]
+        codes.append(iscc.encode(header + value.to_bytes(8, "big")))
+    return codes
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import random
+from io import BytesIO
+import pytest
+import iscc
+from iscc import cdc
+
+pytest.importorskip("numpy")
+
+TESTS_PATH = os.path.dirname(os.path.realpath(__file__))
+os.chdir(TESTS_PATH)
+
+
+def test_cdc_chunks_test_data():
+    with open("test_data.json", encoding="utf-8") as jfile:
+        tests = json.load(jfile)["data_chunks"]
+    for testname, testdata in tests.items():
+        if not testname.startswith("test_"):
+            continue
+        expected = [bytes.fromhex(i.split(":")[1]) for i in testdata["outputs"]]
+        assert list(iscc.cdc_chunks(*testdata["inputs"])) == expected, testname
+
+
+def test_cdc_chunks_equal_reference():
+    random.seed(1)
+    for size in (0, 1, 20, 21, 640, 5000, 70000, 300000):
+        data = bytes([random.getrandbits(8) for _ in range(size)])
+        expected = list(iscc.data_chunks(data))
+        for block_size in (1000, 65536, cdc.CDC_BLOCK_SIZE):
+            assert list(iscc.cdc_chunks(data, block_size)) == expected
+
+
+def test_cdc_chunks_low_entropy():
+    data = b"\x00" * 150000 + b"\xff" * 150000
+    assert list(iscc.cdc_chunks(BytesIO(data), 7000)) == list(iscc.data_chunks(data))
+
+
+def test_cdc_sizes():
+    with open("file_image_lenna.jpg", "rb") as infile:
+        data = infile.read()
+    sizes = iscc.cdc_sizes(data)
+    assert len(sizes) == 112
+    assert sizes[0] == 38
+    assert sizes[-1] == 2840
+    assert sum(sizes) == len(data)
+    partial = iscc.cdc_sizes(data, final=False)
+    assert partial == sizes[: len(partial)]
+    assert len(data) - sum(partial) < iscc.GEAR2_MAX
+
+
+def test_gear_hashes():
+    data = bytes(range(256)) * 2
+    pattern = 0
+    for i, h in enumerate(iscc.gear_hashes(data)):
+        pattern = ((pattern << 1) + iscc.CHUNKING_GEAR[data[i]]) & iscc.MAX_INT64
+        assert int(h) == pattern
+
+
+def test_cdc_chunks_views():
+    data = bytes(range(256)) * 1000
+    chunks = list(iscc.cdc_chunks(data, 10000))
+    views = [bytes(v) for v in iscc.cdc_chunks(BytesIO(data), 10000, views=True)]
+    assert views == chunks
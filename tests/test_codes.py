@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+from array import array
+import pytest
+import iscc
+from iscc import codes
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason="requires numpy")
+
+TESTS_PATH = os.path.dirname(os.path.realpath(__file__))
+os.chdir(TESTS_PATH)
+
+
+def random_digests(n, size=9):
+    random.seed(22)
+    edges = [b"\x00" * size, b"\xff" * size]
+    return edges + [os.urandom(size) for _ in range(n)]
+
+
+def test_decode_codes():
+    digests = random_digests(1000)
+    headers, bodies = iscc.decode_codes([iscc.encode(d) for d in digests])
+    assert list(headers) == [d[0] for d in digests]
+    assert list(bodies) == [int.from_bytes(d[1:], "big") for d in digests]
+
+    digests = random_digests(100, size=8)
+    headers, bodies = iscc.decode_codes(iscc.encode(d) for d in digests)
+    assert headers is None
+    assert list(bodies) == [int.from_bytes(d, "big") for d in digests]
+
+
+def test_decode_codes_like_decode():
+    random.seed(22)
+    symbols = iscc.SYMBOLS + "0lIO+"
+    for width in (11, 13):
+        code_list = ["".join(random.choice(symbols) for _ in range(width))]
+        code_list += ["z" * width, "é" + "z" * (width - 1)]
+        headers, bodies = iscc.decode_codes(code_list)
+        for i, code in enumerate(code_list):
+            digest = iscc.decode(code)
+            assert bodies[i] == int.from_bytes(digest[-8:], "big")
+            if width == 13:
+                assert headers[i] == digest[0]
+
+
+def test_decode_codes_invalid():
+    with pytest.raises(ValueError):
+        iscc.decode_codes(["CCDFPFc87MhdT", "DFPFc87MhdT"])
+    with pytest.raises(ValueError):
+        iscc.decode_codes(["CCDFPFc87Mhd"])
+    headers, bodies = iscc.decode_codes([])
+    assert len(headers) == len(bodies) == 0
+
+
+def test_encode_codes():
+    digests = random_digests(1000)
+    code_list = [iscc.encode(d) for d in digests]
+    headers, bodies = iscc.decode_codes(code_list)
+    assert iscc.encode_codes(headers, bodies) == code_list
+    assert iscc.encode_codes(None, bodies) == [c[2:] for c in code_list]
+    assert iscc.encode_codes(list(headers), list(bodies)) == code_list
+    assert iscc.encode_codes([], []) == []
+    with pytest.raises(ValueError):
+        iscc.encode_codes(headers[:1], bodies)
+
+
+def test_codes_py():
+    digests = random_digests(100)
+    code_list = [iscc.encode(d) for d in digests]
+    headers, bodies = codes.decode_codes_py(code_list, 13)
+    assert headers.typecode == "B" and bodies.typecode == "Q"
+    assert codes.encode_codes_py(headers, bodies) == code_list
+    assert codes.encode_codes_py(None, bodies) == [c[2:] for c in code_list]
+
+
+@requires_numpy
+def test_decode_codes_numpy():
+    code_list = np.array([iscc.encode(d) for d in random_digests(100)])
+    headers, bodies = iscc.decode_codes(code_list)
+    assert headers.dtype == np.uint8 and bodies.dtype == np.uint64
+    assert iscc.encode_codes(headers, bodies) == code_list.tolist()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import os
+import pytest
+import iscc
+from iscc import hamming
+from tests import random_codes
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason="requires numpy")
+
+TESTS_PATH = os.path.dirname(os.path.realpath(__file__))
+os.chdir(TESTS_PATH)
+
+
+def test_distance_many():
+    codes = random_codes(300, [iscc.HEAD_CID_T], 40)
+    _, bodies = iscc.decode_codes(codes)
+    expected = [iscc.distance(codes[0], c) for c in codes]
+    for query in (codes[0], iscc.decode(codes[0]), int(bodies[0])):
+        assert list(iscc.distance_many(query, bodies)) == expected
+        assert list(iscc.distance_many(query, bodies, block_size=7)) == expected
+
+    indices, distances = iscc.distance_many(codes[0], bodies, 12, block_size=7)
+    assert list(indices) == [i for i, d in enumerate(expected) if d <= 12]
+    assert list(distances) == [d for d in expected if d <= 12]
+    indices, distances = iscc.distance_many(codes[0], bodies[:0], 12)
+    assert len(indices) == len(distances) == 0
+
+
+def test_distance_matrix():
+    codes = random_codes(60, [iscc.HEAD_CID_T], 40)
+    _, bodies = iscc.decode_codes(codes)
+    a, b = bodies[:25], bodies[25:]
+    expected = [[iscc.distance(x, y) for y in codes[25:]] for x in codes[:25]]
+    for block_size in (1, 50, 10 ** 6):
+        matrix = iscc.distance_matrix(a, b, block_size=block_size)
+        assert [list(row) for row in matrix] == expected
+
+        rows, cols, distances = iscc.distance_matrix(a, b, 20, block_size)
+        matches = [
+            (i, j, d) for i, row in enumerate(expected) for j, d in enumerate(row)
+        ]
+        matches = [m for m in matches if m[2] <= 20]
+        assert list(zip(rows, cols, distances)) == matches
+
+
+def test_body_value():
+    code = "CCDFPFc87MhdT"
+    body = int.from_bytes(iscc.decode(code)[1:], "big")
+    assert hamming.body_value(code) == body
+    assert hamming.body_value(code[2:]) == body
+    assert hamming.body_value(iscc.decode(code)) == body
+    assert hamming.body_value(body) == body
+    assert hamming.popcount(2 ** 64 - 1) == 64
+
+
+@requires_numpy
+def test_popcount64():
+    values = np.array([0, 1, 2 ** 64 - 1, 0xF0F0], dtype=np.uint64)
+    assert hamming.popcount64(values).tolist() == [0, 1, 64, 8]
+    table = hamming.POPCOUNT_TABLE_NP[values.view(np.uint8)]
+    assert table.reshape(-1, 8).sum(axis=1).tolist() == [0, 1, 64, 8]
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import pytest
+import iscc
+
+np = pytest.importorskip("numpy")
+
+TESTS_PATH = os.path.dirname(os.path.realpath(__file__))
+os.chdir(TESTS_PATH)
+
+IMAGES = (
+    "file_image_cat.jpg",
+    "file_image_cat.png",
+    "file_image_lenna.jpg",
+    "file_image_pixel_png_black.png",
+    "file_image_pixel_png_transp.png",
+    "file_image_pixel_png_white.png",
+)
+
+
+def test_image_hash_batch_equal_reference():
+    random.seed(1)
+    frames = [iscc.image_normalize(path, compact=True) for path in IMAGES]
+    frames += [bytes([random.getrandbits(8) for _ in range(1024)]) for _ in range(50)]
+    frames += [bytes([v]) * 1024 for v in (0, 1, 128, 255)]
+    frames += [bytes([0, 255] * 512), bytes(range(256)) * 4]
+    expected = [iscc.image_hash(frame) for frame in frames]
+    assert iscc.image_hash_batch(frames) == expected
+    stack = np.stack([np.frombuffer(f, dtype=np.uint8) for f in frames])
+    assert iscc.image_hash_batch(stack.reshape(-1, 32, 32)) == expected
+
+
+def test_image_hash_batch_nested_lists():
+    pixels = iscc.image_normalize("file_image_lenna.jpg")
+    assert iscc.image_hash_batch([pixels]) == [iscc.image_hash(pixels)]
+
+
+def test_dct_matrix():
+    values = list(range(32))
+    result = iscc.dct_matrix(32).dot(values)
+    assert np.allclose(result, iscc.dct(values))
+    assert iscc.dct_matrix(32) is iscc.dct_matrix(32)
+
+
+def test_dct_exact():
+    random.seed(2)
+    rows = [[random.getrandbits(8) for _ in range(32)] for _ in range(8)]
+    result = iscc.dct_exact(np.array(rows, dtype=np.float64))
+    assert result.tolist() == [iscc.dct(row) for row in rows]
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import os
+import pytest
+import iscc
+from iscc import index
+from tests import random_codes
+
+TESTS_PATH = os.path.dirname(os.path.realpath(__file__))
+os.chdir(TESTS_PATH)
+
+
+def brute_force(codes, ids, query, k):
+    matches = []
+    for code, id in zip(codes, ids):
+        if code[:2] == query[:2] and iscc.distance(code, query) <= k:
+            matches.append((iscc.distance(code, query), id))
+    return sorted(matches)
+
+
+def results(result):
+    ids, distances = result
+    return [(int(d), int(i)) for i, d in zip(ids, distances)]
+
+
+def test_block_spans():
+    assert index.block_spans(4) == [(48, 16), (32, 16), (16, 16), (0, 16)]
+    assert index.block_spans(3) == [(42, 22), (21, 21), (0, 21)]
+    assert sum(width for _, width in index.block_spans(9)) == 64
+    with pytest.raises(ValueError):
+        index.block_spans(0)
+
+
+def test_neighbor_masks():
+    assert index.neighbor_masks(4, 0) == [0]
+    assert index.neighbor_masks(3, 1) == [0, 1, 2, 4]
+    assert len(index.neighbor_masks(16, 2)) == 1 + 16 + 120
+    assert len(set(index.neighbor_masks(5, 9))) == 32
+
+
+def test_similarity_index_query():
+    headers = [iscc.HEAD_MID, iscc.HEAD_CID_T, iscc.HEAD_DID]
+    codes = random_codes(600, headers, 24)
+    idx = iscc.SimilarityIndex()
+    assert idx.add_many(codes[:400]) == list(range(400))
+    idx.rebuild()
+    # Pending entries after the tables were built
+    assert idx.add_many(codes[400:]) == list(range(400, 600))
+    assert len(idx) == 600
+    assert len(idx.indexes) == 3
+    ids = list(range(600))
+    for query in codes[:20] + codes[450:460]:
+        for k in (0, 3, 8, 12):
+            expected = brute_force(codes, ids, query, k)
+            assert results(idx.query(query, k)) == expected
+
+
+def test_similarity_index_blocks():
+    codes = random_codes(300, [iscc.HEAD_CID_I], 24)
+    for blocks in (1, 5, 9):
+        idx = iscc.SimilarityIndex(blocks=blocks)
+        idx.add_many(codes)
+        idx.rebuild()
+        for query in codes[:10]:
+            expected = brute_force(codes, range(300), query, 8)
+            assert results(idx.query(query, 8)) == expected
+    # Exact queries probe the tables even for one or two wide blocks
+    for blocks in (1, 2):
+        idx = iscc.SimilarityIndex(blocks=blocks)
+        idx.add_many(codes)
+        idx.rebuild()
+        for query in codes[:10]:
+            expected = brute_force(codes, range(300), query, 0)
+            assert results(idx.query(query, 0)) == expected
+
+
+def test_similarity_index_remove():
+    codes = random_codes(100, [iscc.HEAD_CID_A], 24)
+    idx = iscc.SimilarityIndex()
+    ids = [1000 + 2 * i for i in range(100)]
+    idx.add_many(codes, ids)
+    idx.rebuild()
+    for id in ids[:30]:
+        idx.remove(id)
+    with pytest.raises(KeyError):
+        idx.remove(ids[0])
+    assert len(idx) == 70
+    expected = brute_force(codes[30:], ids[30:], codes[0], 10)
+    assert results(idx.query(codes[0], 10)) == expected
+    # Compaction on rebuild
+    for id in ids[30:60]:
+        idx.remove(id)
+    assert len(idx) == 40
+    idx.rebuild()
+    assert len(idx.indexes[iscc.HEAD_CID_A[0]].bodies) == 40
+    expected = brute_force(codes[60:], ids[60:], codes[0], 10)
+    assert results(idx.query(codes[0], 10)) == expected
+    assert idx.add(codes[0]) == ids[-1] + 1
+
+
+def test_similarity_index_headers():
+    body = os.urandom(8)
+    a = iscc.encode(iscc.HEAD_CID_T + body)
+    b = iscc.encode(iscc.HEAD_CID_T_PCF + body)
+    idx = iscc.SimilarityIndex()
+    assert idx.add(a) == 0
+    assert results(idx.query(a, 0)) == [(0, 0)]
+    assert results(idx.query(b, 8)) == []
+    bare = iscc.SimilarityIndex()
+    bare.add(a[2:], id=7)
+    assert results(bare.query(b[2:], 0)) == [(0, 7)]
+
+
+def test_neighbor_count():
+    for width, radius in ((4, 0), (3, 1), (16, 2), (5, 9)):
+        count = index.neighbor_count(width, radius)
+        assert count == len(index.neighbor_masks(width, radius))
+    assert index.neighbor_count(64, 8) > 2 ** 32
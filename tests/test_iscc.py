@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
+import sys
 import json
 import random
 from io import BytesIO
@@ -80,6 +81,39 @@ def test_meta_id():
         iscc.meta_id(b"\xc3\x28")
 
 
+def test_meta_id_batch():
+    titles = [
+        "ISCC Content Identifiers",
+        b"ISCC Content Identifiers",
+        "Die Unendliche Geschichte",
+        " Die unéndlíche,  Geschichte ",
+        "",
+        "Die Unendliche Geschichte",
+    ]
+    extras = ["", "", "Michael Ende", "", "Only extra", "Michael Ende" * 100]
+    expected = [iscc.meta_id(t, e) for t, e in zip(titles, extras)]
+
+    for batch_size in (1, 2, 100):
+        digests, trimmed_titles, trimmed_extras = iscc.meta_id_batch(
+            titles, extras, batch_size=batch_size
+        )
+        assert digests.typecode == "Q"
+        assert [iscc.meta_id_code(d) for d in digests] == [m[0] for m in expected]
+        assert trimmed_titles == [m[1] for m in expected]
+        assert trimmed_extras == [m[2] for m in expected]
+
+    rows = iter([titles[0], (titles[2], extras[2]), [titles[3], extras[3]]])
+    digests, _, trimmed_extras = iscc.meta_id_batch(rows)
+    codes = [iscc.meta_id_code(d) for d in digests]
+    assert codes == [expected[0][0], expected[2][0], expected[3][0]]
+    assert trimmed_extras == ["", "michael ende", ""]
+
+    parallel = iscc.meta_id_batch(zip(titles, extras), workers=2, batch_size=2)
+    assert parallel == iscc.meta_id_batch(titles, extras)
+    digests, trimmed_titles, trimmed_extras = iscc.meta_id_batch([])
+    assert (list(digests), trimmed_titles, trimmed_extras) == ([], [], [])
+
+
 def test_encode():
     digest = bytes.fromhex("f7d3a5b201dc92f7a7")
     code = iscc.encode(digest)
@@ -92,6 +126,50 @@ def test_decode():
     assert digest.hex() == "f7d6bd587d22a7cb6d"
 
 
+def reference_encode(digest):
+    if len(digest) == 9:
+        return reference_encode(digest[:1]) + reference_encode(digest[1:])
+    value, numvalues, chars = int.from_bytes(digest, "big"), 256 ** len(digest), []
+    while numvalues > 0:
+        chars.append(value % 58)
+        value //= 58
+        numvalues //= 58
+    return "".join([chr(c) for c in reversed(chars)]).translate(iscc.V2CTABLE)
+
+
+def reference_decode(code):
+    if len(code) == 13:
+        return reference_decode(code[:2]) + reference_decode(code[2:])
+    value = 0
+    for c in code.translate(iscc.C2VTABLE):
+        value = value * 58 + ord(c)
+    n_bytes = 1 if len(code) == 2 else 8
+    return (value % 256 ** n_bytes).to_bytes(n_bytes, "big")
+
+
+def test_encode_decode_tables():
+    random.seed(21)
+    edges = [b"\x00" * 9, b"\xff" * 9, b"\x00", b"\xff", b"\x80" + b"\x00" * 7]
+    digests = edges + [os.urandom(random.choice((1, 8, 9))) for _ in range(3000)]
+    codes = [iscc.encode(d) for d in digests]
+    assert codes == [reference_encode(d) for d in digests]
+    assert [iscc.decode(c) for c in codes] == digests
+    assert iscc.encode(bytearray(digests[0])) == codes[0]
+
+    # Out of range values and unknown symbols decode like the original
+    symbols = iscc.SYMBOLS + "0lIO+é"
+    for n in (2, 11, 13):
+        for _ in range(500):
+            code = "".join(random.choice(symbols) for _ in range(n))
+            assert iscc.decode(code) == reference_decode(code)
+        assert iscc.decode("z" * n) == reference_decode("z" * n)
+
+    with pytest.raises(ValueError):
+        iscc.decode("C" * 12)
+    with pytest.raises(AssertionError):
+        iscc.encode(b"\x00" * 2)
+
+
 def test_content_id_text():
     cid_t_np = iscc.content_id_text("")
     assert len(cid_t_np) == 13
@@ -118,6 +196,89 @@ def test_text_normalize():
     assert iscc.text_normalize("Hello\nWorld", keep_ws=True) == "hello world"
 
 
+def test_text_filter_table():
+    import unicodedata
+
+    table = iscc.TextFilterTable()
+    chars = "".join(chr(cp) for cp in range(sys.maxunicode + 1))
+    expected = "".join(
+        c
+        for c in chars
+        if unicodedata.category(c) not in iscc.UNICODE_FILTER
+        or c in iscc.CC_WHITESPACE
+    )
+    assert chars.translate(table) == expected
+    assert len(table) == sys.maxunicode + 1
+
+
+def test_text_normalize_prefix():
+    text = "  Iñtërnâtiôn\nàlizætiøn☃💩 –  is a tric\t ky \u00A0 thing!\r " * 50
+    for keep_ws in (True, False):
+        normalized = iscc.text_normalize(text, keep_ws=keep_ws)
+        for size in (0, 1, 13, 128, 10 ** 6):
+            for data in (text, text.encode("utf-8")):
+                prefix = iscc.text_normalize_prefix(data, size, keep_ws=keep_ws)
+                assert normalized.startswith(prefix)
+                assert len(prefix.encode("utf-8")) >= size or prefix == normalized
+    prefix = iscc.text_normalize_prefix(text, 128, keep_ws=True)
+    assert len(prefix) < len(iscc.text_normalize(text, keep_ws=True))
+    assert iscc.text_normalize_prefix("", 128) == ""
+    assert iscc.text_normalize_prefix(" ΣΑΣ  ", 128, keep_ws=True) == "σας"
+    data = text.encode("utf-8")
+    for buffer in (bytearray(data), memoryview(data)):
+        assert iscc.text_normalize_prefix(buffer, 13) == (
+            iscc.text_normalize_prefix(data, 13)
+        )
+    for invalid in (None, 42, ["Hello"]):
+        with pytest.raises(TypeError):
+            iscc.text_normalize_prefix(invalid, 128)
+
+
+def test_meta_id_bytes_like():
+    expected = iscc.meta_id(b"Hello World")
+    assert iscc.meta_id(bytearray(b"Hello World")) == expected
+    assert iscc.meta_id(memoryview(b"Hello World")) == expected
+    with pytest.raises(TypeError):
+        iscc.meta_id(None)
+    # Only the part of the input needed for trimming is decoded
+    with pytest.raises(UnicodeDecodeError):
+        iscc.meta_id(b"Hello \xff World")
+    title = b"Hello World " * 100
+    assert iscc.meta_id(title + b"\xff") == iscc.meta_id(title)
+    # Also without whitespace or punctuation to cut the input at
+    title = b"acgt" * 2 ** 20
+    assert iscc.meta_id(title + b"\xff") == iscc.meta_id(title[:256])
+    assert iscc.meta_id(title.decode("ascii")) == iscc.meta_id(title[:256])
+
+
+def test_text_normalizer_keep_ws():
+    text = "  Hello \t ΣΑΣ\u2000 ᄀ  ㅏ  -  World ? \r\n"
+    expected = iscc.text_normalize(text, keep_ws=True)
+    for size in range(1, len(text) + 1):
+        normalizer = iscc.TextNormalizer(keep_ws=True)
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        result = "".join(normalizer.update(chunk) for chunk in chunks)
+        assert result + normalizer.final() == expected
+
+
+def test_text_normalizer_bounded():
+    # Input without whitespace or punctuation is still flushed
+    for unit in ("acgt", "ACGT", "a.b'c", "Σa"):
+        normalizer = iscc.TextNormalizer()
+        chunk = unit * (2 ** 18 // len(unit))
+        for _ in range(4):
+            assert len(normalizer.update(chunk)) > len(chunk) // 2
+            assert len(normalizer.raw) < 8
+    # Final sigma context across cuts
+    for text in ("AΣ", "AΣ.'", "AΣ.'B", "A.'Σ", "1Σ", "Σ.A", "ΣΣ.Σ'Σ"):
+        expected = iscc.text_normalize(text)
+        for size in range(1, len(text) + 1):
+            normalizer = iscc.TextNormalizer()
+            chunks = [text[i : i + size] for i in range(0, len(text), size)]
+            result = "".join(normalizer.update(chunk) for chunk in chunks)
+            assert result + normalizer.final() == expected
+
+
 def test_trim_text():
     multibyte_2 = "ü" * 128
     trimmed = iscc.text_trim(multibyte_2)
@@ -143,6 +304,26 @@ def test_sliding_window():
     assert list(iscc.sliding_window(words, 2))[0] == ("lorem", "ipsum")
 
 
+def test_ngram_features():
+    import xxhash
+
+    texts = ["", "a", "abc", "Hello World", "iñtërnâtiônàlizætiøn☃💩", "x" * 40]
+    for text in texts:
+        for width in (4, 13):
+            for sep in ("", " "):
+                ngrams = [sep.join(s) for s in iscc.sliding_window(text, width)]
+                features = iscc.ngram_features(text, width, sep=sep)
+                assert features.typecode == "I"
+                assert list(features) == [
+                    xxhash.xxh32(s.encode("utf-8")).intdigest() for s in ngrams
+                ]
+                features = iscc.ngram_features(text, width, bits=64, sep=sep)
+                assert features.typecode == "Q"
+                assert list(features) == [
+                    xxhash.xxh64(s.encode("utf-8")).intdigest() for s in ngrams
+                ]
+
+
 def test_similarity_hash():
     all_zero = 0b0 .to_bytes(8, "big")
     assert iscc.similarity_hash((all_zero, all_zero)) == all_zero
@@ -166,6 +347,42 @@ def test_similarity_hash():
     c = 0b1110010011100100 .to_bytes(2, "big")
     r = 0b0110100001101000 .to_bytes(2, "big")
     assert iscc.similarity_hash((a, b, c)) == r
+    assert iscc.similarity_hash(a + b + c, size=2) == r
+    assert iscc.similarity_hash(bytearray(a + b + c), size=2) == r
+
+
+def reference_similarity_hash(hash_digests):
+    n_bits = len(hash_digests[0]) * 8
+    vector = [0] * n_bits
+    for digest in hash_digests:
+        h = int.from_bytes(digest, "big", signed=False)
+        for i in range(n_bits):
+            vector[i] += h & 1
+            h >>= 1
+    minfeatures = len(hash_digests) * 1.0 / 2
+    shash = sum(int(vector[i] >= minfeatures) << i for i in range(n_bits))
+    return shash.to_bytes(len(hash_digests[0]), "big", signed=False)
+
+
+def test_similarity_hash_buffers():
+    random.seed(20)
+    for size in (1, 4, 8, 32):
+        for n in (1, 2, 3, 10, 101, 5000):
+            # Few distinct digests produce many ties at exactly n / 2
+            pool = [os.urandom(size) for _ in range(3)]
+            digests = [random.choice(pool) for _ in range(n)]
+            expected = reference_similarity_hash(digests)
+            assert iscc.similarity_hash(digests) == expected
+            assert iscc.similarity_hash(b"".join(digests), size=size) == expected
+            assert iscc.bit_counts(b"".join(digests), size, block_size=7) == (
+                iscc.bit_counts(b"".join(digests), size)
+            )
+
+    features = iscc.ngram_features("similarity hash over features", 4, bits=64)
+    digests = [f.to_bytes(8, "big") for f in features]
+    assert iscc.similarity_hash(iscc.big_endian(features)) == (
+        reference_similarity_hash(digests)
+    )
 
 
 def test_hamming_distance():
@@ -259,6 +476,46 @@ def test_data_chunks():
     assert len(chunks2[-1]) == 2840
 
 
+def test_content_id_text_stream(tmp_path):
+    text = "  Iñtërnâtiôn\nàlizætiøn☃💩 –  is a tric\t ky \u00A0 thing!\r"
+    text *= 20
+    text += " ΣΑΣ ᄀㅏ ᄀ\u1161\u11a8 e\u0301\u0327 ﬁ İ " * 20
+    expected = iscc.content_id_text(text)
+    assert iscc.content_id_text_stream([text]) == expected
+    assert iscc.content_id_text_stream(list(text)) == expected
+    assert iscc.content_id_text_stream(BytesIO(text.encode("utf-8"))) == expected
+    data = text.encode("utf-8")
+    chunks = (data[i : i + 7] for i in range(0, len(data), 7))
+    assert iscc.content_id_text_stream(chunks) == expected
+    random.seed(16)
+    for _ in range(20):
+        cuts = sorted(random.sample(range(len(text)), 10))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        assert iscc.content_id_text_stream(chunks) == expected
+    path = tmp_path / "text.txt"
+    path.write_bytes(data)
+    assert iscc.content_id_text_stream(str(path), partial=True) == (
+        iscc.content_id_text(text, partial=True)
+    )
+    for short in ("", " ", "Hello", "Hello World!"):
+        assert iscc.content_id_text_stream([short]) == iscc.content_id_text(short)
+    with pytest.raises(UnicodeDecodeError):
+        iscc.content_id_text_stream([data[:1] + "ü".encode("utf-8")[:1]])
+
+
+def test_content_id_text_signature():
+    text = "Some text for a full minhash signature " * 10
+    code, signature = iscc.content_id_text(text, signature=True)
+    assert code == iscc.content_id_text(text)
+    assert len(signature) == 64
+    features = iscc.ngram_features(iscc.text_normalize(text), 13, sep=" ")
+    assert signature == iscc.minimum_hash(features)
+    assert iscc.content_id_text_stream([text], signature=True) == [code, signature]
+    hasher = iscc.TextIdHasher(text)
+    assert hasher.signature() == signature
+    assert hasher.code() == code
+
+
 def test_content_id_image():
     cid_i = iscc.content_id_image("file_image_lenna.jpg")
     assert len(cid_i) == 13
@@ -1382,3 +1639,195 @@ def test_image_normalize():
             52,
         ],
     ]
+
+
+def test_data_chunks_views():
+    data = open("file_image_lenna.jpg", "rb").read()
+    chunks = list(iscc.data_chunks(data))
+    views = [bytes(view) for view in iscc.data_chunks(BytesIO(data), views=True)]
+    assert views == chunks
+    assert sum(len(c) for c in chunks) == len(data)
+
+
+def test_chunk_sizes():
+    data = open("file_image_lenna.jpg", "rb").read()
+    sizes = iscc.chunk_sizes(data)
+    assert sizes == [len(c) for c in iscc.data_chunks(data)]
+    partial = iscc.chunk_sizes(data, final=False)
+    assert partial == sizes[: len(partial)]
+    assert len(data) - sum(partial) < iscc.GEAR2_MAX
+
+
+def test_data_id_hasher():
+    random.seed(1)
+    data = bytes([random.getrandbits(8) for _ in range(300000)])
+    expected = iscc.data_id(data)
+    hasher = iscc.DataIdHasher(block_size=10000)
+    pos = 0
+    while pos < len(data):
+        step = random.randint(1, 20000)
+        hasher.update(data[pos : pos + step])
+        pos += step
+    assert hasher.code() == expected
+    assert hasher.code() == expected
+    assert iscc.DataIdHasher(data).code() == expected
+    hasher = iscc.DataIdHasher(data[:1000])
+    assert hasher.code() == iscc.data_id(data[:1000])
+    hasher.update(data[1000:])
+    assert hasher.code() == expected
+    code, signature = iscc.data_id(data, signature=True)
+    assert code == expected
+    assert hasher.signature() == signature
+    assert len(signature) == 64
+
+
+def test_data_and_instance_id():
+    did, iid, h = iscc.data_and_instance_id("file_image_lenna.jpg")
+    assert did == iscc.data_id("file_image_lenna.jpg")
+    assert [iid, h] == iscc.instance_id("file_image_lenna.jpg")
+    random.seed(1)
+    data = bytes([random.getrandbits(8) for _ in range(1100000)])
+    did, iid, h = iscc.data_and_instance_id(BytesIO(data))
+    assert did == iscc.data_id(data)
+    assert [iid, h] == iscc.instance_id(data)
+
+
+def test_instance_id_workers():
+    random.seed(1)
+    for size in (1, 64000, 66000, 3000000):
+        data = bytes([random.getrandbits(8) for _ in range(size)])
+        assert iscc.instance_id(data, workers=4) == iscc.instance_id(data)
+        assert iscc.instance_id(data, workers=2, max_pending=1) == (
+            iscc.instance_id(data)
+        )
+    digests = list(iscc.leaf_digests_parallel(BytesIO(data), 2, 1, 3))
+    assert digests == iscc.leaf_digests(data)
+
+
+def test_top_hash():
+    def recursive_top_hash(hashes):
+        if len(hashes) == 1:
+            return hashes[0]
+        pairs = [
+            iscc.hash_inner_nodes(hashes[i], hashes[i + 1])
+            for i in range(0, len(hashes) - 1, 2)
+        ]
+        if len(hashes) % 2 == 1:
+            pairs.append(iscc.hash_inner_nodes(hashes[-1], hashes[-1]))
+        return recursive_top_hash(pairs)
+
+    leaves = [iscc.sha256d(bytes([i])) for i in range(40)]
+    for n in range(1, 41):
+        assert iscc.top_hash(leaves[:n]) == recursive_top_hash(leaves[:n])
+        assert iscc.top_hash(iter(leaves[:n])) == recursive_top_hash(leaves[:n])
+    with pytest.raises(ValueError):
+        iscc.top_hash([])
+
+
+def test_instance_id_hasher():
+    random.seed(1)
+    data = bytes([random.getrandbits(8) for _ in range(330000)])
+    code, hex_hash = iscc.instance_id(data)
+    hasher = iscc.InstanceIdHasher()
+    pos = 0
+    while pos < len(data):
+        step = random.randint(1, 100000)
+        hasher.update(data[pos : pos + step])
+        pos += step
+        assert hasher.code() == iscc.instance_id(data[:pos])[0]
+    assert hasher.code() == code
+    assert hasher.hexdigest() == hex_hash
+    assert iscc.InstanceIdHasher(data[:128000]).code() == iscc.instance_id(
+        data[:128000]
+    )[0]
+
+
+def test_image_normalize_compact():
+    pixels = iscc.image_normalize("file_image_cat.jpg")
+    compact = iscc.image_normalize("file_image_cat.jpg", compact=True)
+    assert isinstance(compact, bytes)
+    assert len(compact) == 1024
+    assert list(compact) == [p for row in pixels for p in row]
+    assert iscc.image_hash(compact) == iscc.image_hash(pixels)
+    assert iscc.image_hash(bytearray(compact)) == iscc.image_hash(pixels)
+    assert iscc.image_hash(memoryview(compact)) == iscc.image_hash(pixels)
+    # Only buffers are compact, 1024 rows of one pixel stay rows
+    rows = [[p] for row in pixels for p in row]
+    assert iscc.image_hash(rows) != iscc.image_hash(pixels)
+
+
+def test_content_id_image_fast():
+    for path in ("file_image_lenna.jpg", "file_image_cat.png"):
+        cid_ref = iscc.content_id_image(path)
+        cid_fast = iscc.content_id_image(path, fast=True)
+        assert cid_fast[:2] == cid_ref[:2]
+        assert iscc.distance(cid_ref, cid_fast) <= 6
+    black = "file_image_pixel_png_black.png"
+    assert iscc.content_id_image(black, fast=True) == iscc.content_id_image(black)
+    pixels = iscc.image_normalize("file_image_lenna.jpg", compact=True, fast=True)
+    assert len(pixels) == 1024
+    # Images passed in by the caller are not drafted in place
+    img = Image.open("file_image_lenna.jpg")
+    size, mode = img.size, img.mode
+    iscc.content_id_image(img, fast=True)
+    iscc.content_id_image_batch([img], fast=True)
+    assert (img.size, img.mode) == (size, mode)
+    assert img.size == (512, 512)
+
+
+def test_content_id_image_batch():
+    images = [
+        "file_image_lenna.jpg",
+        "file_image_does_not_exist.jpg",
+        BytesIO(open("file_image_cat.png", "rb").read()),
+        BytesIO(b"not an image"),
+        Image.open("file_image_pixel_png_white.png"),
+    ]
+    results = iscc.content_id_image_batch(images, workers=2, batch_size=2)
+    assert len(results) == 5
+    assert results[0] == iscc.content_id_image("file_image_lenna.jpg")
+    assert isinstance(results[1], IOError)
+    assert results[2] == iscc.content_id_image("file_image_cat.png")
+    assert isinstance(results[3], Exception)
+    assert results[4] == iscc.content_id_image("file_image_pixel_png_white.png")
+    partial = iscc.content_id_image_batch(["file_image_lenna.jpg"], partial=True)
+    assert partial == [iscc.content_id_image("file_image_lenna.jpg", partial=True)]
+    assert iscc.content_id_image_batch([]) == []
+
+
+def test_image_normalize_raw():
+    img = Image.open("file_image_lenna.jpg")
+    expected = iscc.image_normalize(img, compact=True)
+    gray = img.convert("L")
+    raw = gray.tobytes()
+    assert iscc.image_normalize(raw, compact=True, size=gray.size) == expected
+    assert iscc.image_normalize(bytearray(raw), size=gray.size) == (
+        iscc.image_normalize(img)
+    )
+    rgb = img.convert("RGB")
+    normalized = iscc.image_normalize(rgb.tobytes(), size=rgb.size, mode="RGB")
+    assert normalized == iscc.image_normalize(rgb)
+    frame = iscc.image_frame(bytearray(rgb.tobytes()), rgb.size, mode="RGB")
+    assert frame.tobytes() == rgb.tobytes()
+    rgba = img.convert("RGBA")
+    data = bytearray(rgba.tobytes())
+    frame = iscc.image_frame(data, rgba.size, mode="RGBA")
+    assert iscc.image_normalize(frame) == iscc.image_normalize(rgba)
+    # Mappable modes share the buffer instead of copying it
+    data[:4] = b"\x01\x02\x03\x04"
+    assert frame.getpixel((0, 0)) == (1, 2, 3, 4)
+    with pytest.raises(ValueError):
+        iscc.image_normalize(raw[:-1], size=gray.size)
+
+
+def test_image_normalize_raw_array():
+    np = pytest.importorskip("numpy")
+    gray = Image.open("file_image_lenna.jpg").convert("L")
+    frame = np.frombuffer(gray.tobytes(), dtype=np.uint8)
+    frame = frame.reshape(gray.height, gray.width)
+    expected = iscc.image_normalize(gray, compact=True)
+    assert iscc.image_normalize(frame, compact=True, size=gray.size) == expected
+    padded = np.zeros((gray.height, gray.width + 3), dtype=np.uint8)
+    padded[:, : gray.width] = frame
+    view = padded[:, : gray.width]
+    assert iscc.image_normalize(view, compact=True, size=gray.size) == expected
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import pytest
+import iscc
+
+TESTS_PATH = os.path.dirname(os.path.realpath(__file__))
+os.chdir(TESTS_PATH)
+
+
+def random_texts(n):
+    random.seed(25)
+    words = ["word%d" % i for i in range(2000)]
+    base = [random.choice(words) for _ in range(300)]
+    texts = []
+    for _ in range(n):
+        # Replace a random share of the base words to get all similarities
+        text = list(base)
+        for _ in range(random.randint(0, 300)):
+            text[random.randrange(len(text))] = random.choice(words)
+        texts.append(" ".join(text))
+    return texts
+
+
+def jaccard(a, b):
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def test_lsh_query():
+    signatures = [iscc.content_id_text(t, signature=True)[1] for t in random_texts(60)]
+    lsh = iscc.MinHashLSH()
+    assert lsh.add_many(signatures) == list(range(60))
+    assert len(lsh) == 60
+    for i, query in enumerate(signatures[:10]):
+        ids, similarities = lsh.query(query)
+        assert ids[0] == i
+        assert similarities[0] == 1.0
+        assert similarities == sorted(similarities, reverse=True)
+        assert similarities == [jaccard(query, signatures[id]) for id in ids]
+        # Every candidate shares at least one complete band with the query
+        for id in ids:
+            assert any(
+                signatures[id][b * 4 : b * 4 + 4] == query[b * 4 : b * 4 + 4]
+                for b in range(16)
+            )
+        # Signatures sharing a band are never missed
+        expected = [
+            id
+            for id, other in enumerate(signatures)
+            if any(
+                other[b * 4 : b * 4 + 4] == query[b * 4 : b * 4 + 4] for b in range(16)
+            )
+        ]
+        assert sorted(ids) == expected
+        ids, similarities = lsh.query(query, threshold=0.5, limit=3)
+        assert len(ids) <= 3
+        assert all(s >= 0.5 for s in similarities)
+
+
+def test_lsh_remove():
+    signatures = [iscc.data_id(os.urandom(2000), signature=True)[1] for _ in range(5)]
+    lsh = iscc.MinHashLSH(bands=8, rows=8)
+    ids = lsh.add_many(signatures, [10, 20, 30, 40, 50])
+    assert ids == [10, 20, 30, 40, 50]
+    assert lsh.add(signatures[0]) == 51
+    assert lsh.query(signatures[0])[0] == [10, 51]
+    lsh.remove(10)
+    assert lsh.query(signatures[0]) == [[51], [1.0]]
+    assert len(lsh) == 5
+    with pytest.raises(KeyError):
+        lsh.remove(10)
+    with pytest.raises(ValueError):
+        lsh.add(signatures[1], id=20)
+
+
+def test_lsh_compaction():
+    signatures = [iscc.data_id(os.urandom(2000), signature=True)[1] for _ in range(40)]
+    lsh = iscc.MinHashLSH()
+    for _ in range(5):
+        ids = lsh.add_many(signatures)
+        for id in ids[:-1]:
+            lsh.remove(id)
+        # Removed signatures never take more than half of the storage
+        assert len(lsh.ids) <= 2 * len(lsh) + 1
+    assert len(lsh) == 5
+    lsh.remove(ids[-1])
+    lsh.rebuild()
+    assert len(lsh.ids) == 4
+    assert len(lsh.signatures) == 4 * 64
+    assert sum(len(b) for table in lsh.tables for b in table.values()) == 4 * 16
+    for signature in signatures[:-1]:
+        assert lsh.query(signature)[0] == []
+    assert lsh.query(signatures[-1]) == [[39, 79, 119, 159], [1.0] * 4]
+
+
+def test_lsh_errors():
+    with pytest.raises(ValueError):
+        iscc.MinHashLSH(bands=16, rows=5)
+    lsh = iscc.MinHashLSH(bands=4, rows=4, n=16)
+    with pytest.raises(ValueError):
+        lsh.add(list(range(64)))
+    with pytest.raises(ValueError):
+        lsh.add_many([list(range(16))], ids=[1, 2])
+    assert lsh.query(list(range(16))) == [[], []]
+
+
+def test_lsh_probability():
+    assert iscc.lsh_probability(1.0) == 1.0
+    assert iscc.lsh_probability(0.0) == 0.0
+    threshold = iscc.lsh_threshold()
+    assert threshold == pytest.approx(0.5)
+    assert iscc.lsh_probability(0.3) < 0.2 < 0.9 < iscc.lsh_probability(0.7)
+    assert iscc.lsh_threshold(8, 8) > threshold
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import random
+from array import array
+import pytest
+import iscc
+from iscc import minhash
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason="requires numpy")
+
+TESTS_PATH = os.path.dirname(os.path.realpath(__file__))
+os.chdir(TESTS_PATH)
+
+
+def test_minhasher_test_data():
+    with open("test_data.json", encoding="utf-8") as jfile:
+        tests = json.load(jfile)["minimum_hash"]
+    for testname, testdata in tests.items():
+        if not testname.startswith("test_"):
+            continue
+        hasher = iscc.MinHasher(*testdata["inputs"])
+        assert hasher.signature() == testdata["outputs"]
+
+
+@pytest.mark.parametrize("backend", ["numpy", "python"])
+def test_minhasher_equal_reference(backend, monkeypatch):
+    if backend == "numpy" and np is None:
+        pytest.skip("requires numpy")
+    if backend == "python":
+        monkeypatch.setattr(minhash, "np", None)
+    random.seed(1)
+    features = [random.getrandbits(32) for _ in range(3000)]
+    expected = iscc.minimum_hash(features)
+    assert iscc.MinHasher(features).signature() == expected
+    assert iscc.MinHasher(features, block_size=1000).signature() == expected
+    assert iscc.MinHasher(iter(features), block_size=7).signature() == expected
+    assert iscc.MinHasher(array("I", features)).signature() == expected
+    hasher = iscc.MinHasher(features, n=16)
+    assert hasher.signature() == iscc.minimum_hash(features, n=16)
+
+
+@requires_numpy
+def test_minhasher_numpy_input():
+    features = np.arange(0, 2 ** 32, 2 ** 20, dtype=np.uint32)
+    expected = iscc.minimum_hash(features.tolist())
+    assert iscc.MinHasher(features, block_size=100).signature() == expected
+
+
+def test_minhasher_extremes():
+    features = [0, 1, 2 ** 32 - 1, 2 ** 64 - 1, 2 ** 63, iscc.MERSENNE_PRIME]
+    for f in features:
+        assert iscc.MinHasher([f]).signature() == iscc.minimum_hash([f])
+
+
+@pytest.mark.parametrize("backend", ["numpy", "python"])
+def test_minhasher(backend, monkeypatch):
+    if backend == "numpy" and np is None:
+        pytest.skip("requires numpy")
+    if backend == "python":
+        monkeypatch.setattr(minhash, "np", None)
+    random.seed(2)
+    features = [random.getrandbits(32) for _ in range(1000)]
+    hasher = iscc.MinHasher()
+    hasher.update(features[:10])
+    hasher.update(iter(features[10:500]))
+    hasher.update(x for x in features[500:])
+    assert hasher.count == 1000
+    assert hasher.signature() == iscc.minimum_hash(features)
+    assert iscc.MinHasher(features, n=8).signature() == iscc.minimum_hash(
+        features, n=8
+    )
+    lsb = "".join(str(x & 1) for x in hasher.signature())
+    assert hasher.digest() == int(lsb, 2).to_bytes(8, "big")
+
+
+def test_minhasher_empty():
+    with pytest.raises(ValueError):
+        iscc.MinHasher().signature()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import os
+import io
+import tempfile
+from io import BytesIO
+import iscc
+
+
+TESTS_PATH = os.path.dirname(os.path.realpath(__file__))
+os.chdir(TESTS_PATH)
+
+
+def test_data_view_bytes():
+    with iscc.data_view(b"abc") as view:
+        assert isinstance(view, memoryview)
+        assert view == b"abc"
+
+
+def test_data_view_bytesio():
+    stream = BytesIO(b"abcdef")
+    stream.seek(2)
+    with iscc.data_view(stream) as view:
+        assert view == b"cdef"
+    assert stream.tell() == 6
+    stream.write(b"resizable again")
+
+
+def test_data_view_file():
+    with open("file_image_lenna.jpg", "rb") as infile:
+        data = infile.read()
+        infile.seek(100)
+        with iscc.data_view(infile) as view:
+            assert view == data[100:]
+        assert infile.read() == b""
+
+
+def test_data_view_fallback():
+    read_fd, write_fd = os.pipe()
+    with io.open(read_fd, "rb") as pipe:
+        with iscc.data_view(pipe) as view:
+            assert view is None
+    os.close(write_fd)
+    with tempfile.TemporaryFile() as empty:
+        with iscc.data_view(empty) as view:
+            assert view is None
+
+
+def test_read_blocks():
+    data = bytes(range(256)) * 10
+    blocks = [bytes(b) for b in iscc.read_blocks(memoryview(data), 1000)]
+    assert blocks == [data[:1000], data[1000:2000], data[2000:]]
+    assert [bytes(b) for b in iscc.read_blocks(BytesIO(data), 1000)] == blocks
+    reused = [bytes(b) for b in iscc.read_blocks(BytesIO(data), 1000, reuse=True)]
+    assert reused == blocks
+
+
+def test_ids_from_pipe():
+    data = open("file_image_lenna.jpg", "rb").read()
+    read_fd, write_fd = os.pipe()
+    with io.open(read_fd, "rb") as pipe, io.open(write_fd, "wb") as writer:
+        writer.write(data[:30000])
+        writer.close()
+        assert iscc.instance_id(pipe) == iscc.instance_id(data[:30000])
+    assert iscc.instance_id("file_image_lenna.jpg") == iscc.instance_id(data)
+    assert iscc.data_id("file_image_lenna.jpg") == iscc.data_id(BytesIO(data))
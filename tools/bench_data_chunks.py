@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Benchmark memory and time per chunk of Data-ID chunking.
+
+Streams random data of increasing size through the chunkers and reports the
+peak traced memory and the time spent per chunk. With the reusable chunking
+buffer both numbers stay flat regardless of the input size.
+"""
+import os
+import time
+import tracemalloc
+from io import BytesIO
+import iscc
+
+
+SIZES_MB = (1, 4, 16)
+
+
+def measure(func, data):
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = 0
+    for _ in func(BytesIO(data)):
+        chunks += 1
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return chunks, seconds, peak
+
+
+def main():
+    chunkers = [
+        ("data_chunks", iscc.data_chunks),
+        ("data_chunks views", lambda d: iscc.data_chunks(d, views=True)),
+    ]
+    if iscc.cdc.np:
+        chunkers += [
+            ("cdc_chunks", iscc.cdc_chunks),
+            ("cdc_chunks views", lambda d: iscc.cdc_chunks(d, views=True)),
+        ]
+
+    header = ("chunker", "MB", "chunks", "us/chunk", "peak KB")
+    print("%-18s %6s %8s %12s %12s" % header)
+    for size in SIZES_MB:
+        data = os.urandom(size * 2 ** 20)
+        for name, func in chunkers:
+            chunks, seconds, peak = measure(func, data)
+            print(
+                "%-18s %6d %8d %12.1f %12.1f"
+                % (name, size, chunks, seconds / chunks * 1e6, peak / 1024)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Benchmark bulk Hamming distances against a Python loop over `distance`.
+
+Generates a catalog of random codes, decodes it once with `decode_codes` and
+compares one query against the catalog (`distance_many`) and a batch of
+queries against the catalog (`distance_matrix`, with a threshold). The loop
+over `distance` is measured on a sample and reported per comparison.
+
+Usage: python bench_distance.py [catalog size]  (default 1000000)
+"""
+import os
+import sys
+import time
+import iscc
+
+
+CATALOG_SIZE = 10 ** 6
+LOOP_SAMPLE = 10 ** 5
+QUERIES = 100
+THRESHOLD = 12
+
+
+def main(args):
+    size = int(args[0]) if args else CATALOG_SIZE
+    codes = [iscc.encode(os.urandom(9)) for _ in range(size)]
+
+    start = time.perf_counter()
+    _, bodies = iscc.decode_codes(codes)
+    decode_seconds = time.perf_counter() - start
+
+    sample = codes[:LOOP_SAMPLE]
+    start = time.perf_counter()
+    for code in sample:
+        iscc.distance(codes[0], code)
+    loop_ns = (time.perf_counter() - start) / len(sample) * 1e9
+
+    start = time.perf_counter()
+    iscc.distance_many(codes[0], bodies)
+    many_ns = (time.perf_counter() - start) / size * 1e9
+
+    start = time.perf_counter()
+    iscc.distance_many(codes[0], bodies, THRESHOLD)
+    many_threshold_ns = (time.perf_counter() - start) / size * 1e9
+
+    start = time.perf_counter()
+    iscc.distance_matrix(bodies[:QUERIES], bodies, THRESHOLD)
+    matrix_ns = (time.perf_counter() - start) / (size * QUERIES) * 1e9
+
+    print("catalog size:                %d" % size)
+    print("decode_codes:                %.3f s" % decode_seconds)
+    print("%-28s %10s %10s" % ("method", "ns/pair", "speedup"))
+    results = [
+        ("loop over distance", loop_ns),
+        ("distance_many", many_ns),
+        ("distance_many threshold", many_threshold_ns),
+        ("distance_matrix threshold", matrix_ns),
+    ]
+    for name, ns in results:
+        print("%-28s %10.2f %10.1f" % (name, ns, loop_ns / ns))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
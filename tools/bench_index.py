@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Benchmark range queries of `SimilarityIndex` against a linear scan.
+
+Builds an index over a catalog of random Content-ID-Image codes and answers
+queries (catalog codes with a few flipped bits) with increasing distance `k`,
+comparing against `distance_many` with a threshold over all bodies. Results of
+both methods are checked to be equal.
+
+Usage: python bench_index.py [catalog size]  (default 1000000)
+"""
+
+import os
+import sys
+import time
+import random
+import iscc
+
+CATALOG_SIZE = 10 ** 6
+QUERIES = 100
+DISTANCES = (0, 4, 8)
+
+
+def main(args):
+    size = int(args[0]) if args else CATALOG_SIZE
+    random.seed(0)
+    codes = [iscc.encode(iscc.HEAD_CID_I + os.urandom(8)) for _ in range(size)]
+    _, bodies = iscc.decode_codes(codes)
+    queries = []
+    for code in random.sample(codes, QUERIES):
+        body = int(iscc.decode_codes([code])[1][0])
+        for _ in range(random.randint(0, 6)):
+            body ^= 1 << random.randrange(64)
+        queries.append(iscc.encode(iscc.HEAD_CID_I + body.to_bytes(8, "big")))
+
+    index = iscc.SimilarityIndex()
+    start = time.perf_counter()
+    index.add_many(codes)
+    index.rebuild()
+    build_seconds = time.perf_counter() - start
+
+    print("catalog size:  %d" % size)
+    print("index build:   %.3f s" % build_seconds)
+    print("%-4s %14s %14s %10s" % ("k", "scan ms/query", "index ms/query", "speedup"))
+    for k in DISTANCES:
+        start = time.perf_counter()
+        scans = [iscc.distance_many(q, bodies, k) for q in queries]
+        scan_ms = (time.perf_counter() - start) / QUERIES * 1000
+        start = time.perf_counter()
+        found = [index.query(q, k) for q in queries]
+        index_ms = (time.perf_counter() - start) / QUERIES * 1000
+        for (indices, _), (ids, _) in zip(scans, found):
+            assert sorted(map(int, indices)) == sorted(map(int, ids))
+        print("%-4d %14.3f %14.3f %10.1f" % (k, scan_ms, index_ms, scan_ms / index_ms))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
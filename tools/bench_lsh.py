@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Compare LSH banding candidates with Hamming distance candidates.
+
+Generates a catalog of texts derived from a few base texts with a random share
+of replaced words and computes Content-ID-Text codes with full minhash
+signatures. For each query, candidates from `MinHashLSH` are compared with the
+codes within Hamming distance thresholds. A candidate is relevant if its
+estimated Jaccard similarity with the query is at least `lsh_threshold()`.
+
+Usage: python bench_lsh.py [catalog size]  (default 2000)
+"""
+
+import sys
+import time
+import random
+import iscc
+
+CATALOG_SIZE = 2000
+BASE_TEXTS = 20
+QUERIES = 50
+HAMMING_THRESHOLDS = (12, 20)
+
+
+def catalog_texts(size):
+    random.seed(0)
+    words = ["word%d" % i for i in range(5000)]
+    bases = [[random.choice(words) for _ in range(500)] for _ in range(BASE_TEXTS)]
+    texts = []
+    for _ in range(size):
+        text = list(random.choice(bases))
+        for _ in range(random.randint(0, len(text))):
+            text[random.randrange(len(text))] = random.choice(words)
+        texts.append(" ".join(text))
+    return texts
+
+
+def jaccard(a, b):
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def main(args):
+    size = int(args[0]) if args else CATALOG_SIZE
+    results = [iscc.content_id_text(t, signature=True) for t in catalog_texts(size)]
+    codes = [code for code, _ in results]
+    signatures = [signature for _, signature in results]
+    _, bodies = iscc.decode_codes(codes)
+
+    lsh = iscc.MinHashLSH()
+    start = time.perf_counter()
+    lsh.add_many(signatures)
+    build_seconds = time.perf_counter() - start
+
+    threshold = iscc.lsh_threshold()
+    methods = [
+        ("hamming <= %d" % k, lambda q, k=k: iscc.distance_many(codes[q], bodies, k)[0])
+        for k in HAMMING_THRESHOLDS
+    ]
+    methods += [
+        ("lsh bands", lambda q: lsh.query(signatures[q])[0]),
+        ("lsh re-ranked", lambda q: lsh.query(signatures[q], threshold)[0]),
+    ]
+    totals = {name: [0, 0, 0.0] for name, _ in methods}
+    relevant_total = 0
+    for query in range(QUERIES):
+        relevant = {
+            i
+            for i, s in enumerate(signatures)
+            if jaccard(signatures[query], s) >= threshold
+        }
+        relevant_total += len(relevant)
+        for name, method in methods:
+            start = time.perf_counter()
+            found = set(map(int, method(query)))
+            totals[name][2] += time.perf_counter() - start
+            totals[name][0] += len(found)
+            totals[name][1] += len(found & relevant)
+
+    print("catalog size:      %d" % size)
+    print("lsh build:         %.3f s" % build_seconds)
+    print("jaccard threshold: %.2f" % threshold)
+    header = ("method", "candidates", "precision", "recall", "ms/query")
+    print("%-14s %12s %10s %10s %10s" % header)
+    for name, _ in methods:
+        found, hits, seconds = totals[name]
+        print(
+            "%-14s %12d %10.3f %10.3f %10.3f"
+            % (
+                name,
+                found,
+                hits / max(found, 1),
+                hits / max(relevant_total, 1),
+                seconds / QUERIES * 1000,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Benchmark n-gram feature hashing for Content-ID-Text and Meta-ID.
+
+Compares the per n-gram generator pipeline (slice, join, encode, xxhash) with
+`ngram_features`, which encodes the text once and hashes buffer windows. ASCII
+and mixed multi-byte text is measured separately because `ngram_features`
+uses a fixed stride for single byte characters.
+
+Usage: python bench_ngram_features.py [size in KB ...]  (default 1 1024 102400)
+"""
+import sys
+import time
+import random
+from array import array
+import xxhash
+import iscc
+
+
+SIZES_KB = (1, 1024, 100 * 1024)
+ALPHABETS = {
+    "ascii": "abcdefghijklmnopqrstuvwxyz0123456789",
+    "mixed": "abcdefghijklmnopqrstuvwxyzäöüßéèñçøæ☃日本語",
+}
+
+
+def generator_pipeline(text, width, bits, sep):
+    typecode, hasher = ("I", xxhash.xxh32) if bits == 32 else ("Q", xxhash.xxh64)
+    ngrams = (sep.join(l) for l in iscc.sliding_window(text, width))
+    return array(typecode, (hasher(s.encode("utf-8")).intdigest() for s in ngrams))
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or SIZES_KB
+    cases = [
+        ("content_id_text", iscc.WINDOW_SIZE_CID_T, 32, " "),
+        ("meta_id", iscc.WINDOW_SIZE_MID, 64, ""),
+    ]
+    random.seed(0)
+    header = ("case", "text", "KB", "generator s", "features s", "speedup")
+    print("%-16s %-6s %8s %12s %12s %8s" % header)
+    for size in sizes:
+        for name, alphabet in sorted(ALPHABETS.items()):
+            text = "".join(random.choice(alphabet) for _ in range(size * 1024))
+            for case, width, bits, sep in cases:
+                old, expected = measure(generator_pipeline, text, width, bits, sep)
+                new, features = measure(iscc.ngram_features, text, width, bits, sep)
+                assert features == expected
+                del expected, features
+                print(
+                    "%-16s %-6s %8d %12.4f %12.4f %8.2f"
+                    % (case, name, size, old, new, old / new)
+                )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
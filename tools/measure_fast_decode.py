@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Measure how fast decode mode changes Content-ID-Image.
+
+Compares `content_id_image(img, fast=True)` with the reference for a set of
+images and reports timing, how many codes differ and by how many bits.
+
+Usage: python measure_fast_decode.py [image files or directories ...]
+
+Without arguments large JPEG and PNG variants of the test images (scaled,
+cropped, rotated) are generated in a temporary directory.
+"""
+import os
+import sys
+import time
+import tempfile
+from collections import Counter
+from PIL import Image
+import iscc
+
+
+TESTS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests")
+SOURCES = ("file_image_lenna.jpg", "file_image_cat.jpg")
+WIDTHS = (300, 800, 1600, 3200, 6400)
+
+
+def generate_images(outdir):
+    paths = []
+    for source in SOURCES:
+        base = Image.open(os.path.join(TESTS_PATH, source)).convert("RGB")
+        variants = {
+            "full": base,
+            "crop": base.crop((10, 10, base.width - 10, base.height - 30)),
+            "rot": base.rotate(90, expand=True),
+        }
+        for name, img in variants.items():
+            for width in WIDTHS:
+                height = max(1, width * img.height // img.width)
+                scaled = img.resize((width, height), Image.BICUBIC)
+                for ext, quality in (("jpg", 90), ("jpg", 60), ("png", None)):
+                    path = os.path.join(
+                        outdir, "%s_%s_%d_%s.%s" % (source, name, width, quality, ext)
+                    )
+                    kwargs = {"quality": quality} if quality else {}
+                    scaled.save(path, **kwargs)
+                    paths.append(path)
+    return paths
+
+
+def collect(args):
+    paths = []
+    for arg in args:
+        if os.path.isdir(arg):
+            for root, _, files in os.walk(arg):
+                paths.extend(os.path.join(root, f) for f in sorted(files))
+        else:
+            paths.append(arg)
+    return paths
+
+
+def main(args):
+    tmpdir = None
+    if args:
+        paths = collect(args)
+    else:
+        tmpdir = tempfile.TemporaryDirectory()
+        paths = generate_images(tmpdir.name)
+
+    distances = Counter()
+    times = {False: 0.0, True: 0.0}
+    for path in paths:
+        codes = {}
+        for fast in (False, True):
+            start = time.perf_counter()
+            codes[fast] = iscc.content_id_image(path, fast=fast)
+            times[fast] += time.perf_counter() - start
+        distances[iscc.distance(codes[False], codes[True])] += 1
+
+    total = sum(distances.values())
+    differing = total - distances[0]
+    print("images:            %d" % total)
+    print("reference seconds: %.2f" % times[False])
+    print("fast seconds:      %.2f" % times[True])
+    print("differing codes:   %d (%.1f%%)" % (differing, 100.0 * differing / total))
+    print("bit distance histogram:")
+    for bits in sorted(distances):
+        print("  %2d bits: %d" % (bits, distances[bits]))
+
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])